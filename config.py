@@ -3,8 +3,11 @@
 import os
 from dotenv import load_dotenv
 
-# Load environment variables from .env file
-load_dotenv()
+# Load environment variables from .env file (once per process tree; the
+# marker is inherited by forked workers)
+if not os.environ.get("_STRESSEASE_DOTENV_LOADED"):
+    load_dotenv()
+    os.environ["_STRESSEASE_DOTENV_LOADED"] = "1"
 
 
 class Config:
@@ -14,6 +17,9 @@ class Config:
     SECRET_KEY = os.getenv("SECRET_KEY", "dev-secret-key-change-in-production")
     DEBUG = os.getenv("FLASK_DEBUG", "False").lower() == "true"
 
+    # Reject request bodies larger than 64KB before they are parsed
+    MAX_CONTENT_LENGTH = 64 * 1024
+
     # Google Gemini API Configuration
     GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
 
@@ -24,6 +30,12 @@ class Config:
     # Cloud deployment uses FIREBASE_CREDENTIALS_JSON instead
     FIREBASE_CREDENTIALS_PATH = os.getenv("FIREBASE_CREDENTIALS_PATH")
 
+    # Analytics: use the template explanation instead of the LLM when the
+    # prediction confidence is low (fewer than 4 days of mood logs)
+    SKIP_LLM_EXPLANATION_LOW_CONF = os.getenv(
+        "SKIP_LLM_EXPLANATION_LOW_CONF", "False"
+    ).lower() in ("1", "true")
+
     @classmethod
     def validate_config(cls):
         """Validate required environment variables.
@@ -0,0 +1,33 @@
+"""Gunicorn configuration for production deployment (Render, Heroku, etc.).
+
+Usage: gunicorn wsgi:app  (this file is picked up automatically)
+
+The API is I/O-bound (Firestore and Gemini calls), so each worker runs a pool
+of threads that can wait on those calls concurrently.
+"""
+
+import multiprocessing
+import os
+
+# Bind to the platform-assigned port
+bind = f"0.0.0.0:{os.environ.get('PORT', '5000')}"
+
+# Worker processes; WEB_CONCURRENCY overrides the CPU-based default
+workers = int(os.environ.get("WEB_CONCURRENCY", multiprocessing.cpu_count() * 2 + 1))
+worker_class = "gthread"
+threads = int(os.environ.get("GUNICORN_THREADS", "8"))
+
+# Reuse client connections between requests
+keepalive = 5
+
+# LLM calls can take several seconds; leave headroom before killing a worker
+timeout = 120
+graceful_timeout = 30
+
+# Not preloaded: the Firestore gRPC channel and the module-level thread pools
+# are not fork-safe, so each worker builds its own app after forking
+preload_app = False
+
+accesslog = "-"
+errorlog = "-"
+loglevel = "info"
@@ -1,13 +1,133 @@
 """Flask app factory. Registers blueprints and initializes services."""
 
-from flask import Flask, jsonify
+from flask import Flask, abort, jsonify, request
 from config import Config
+from stressease.services.utility import firebase_config
+from stressease.services.chat import llm_service
+from stressease.services.utility.json_provider import OrjsonProvider
 from datetime import datetime
+import concurrent.futures
+import json
+import threading
+import time
 import logging
 
 logger = logging.getLogger(__name__)
 
 
+# ============================================================================
+# HEALTH CHECK CACHE
+# ============================================================================
+# Orchestrators poll /health every few seconds; serve repeat polls from memory.
+# Only healthy results are cached, so a recovered dependency is reported on
+# the next poll rather than after the TTL.
+_HEALTH_TTL = 5.0
+_health_cache = {"ts": 0.0, "payload": None}
+_health_lock = threading.Lock()
+
+# Probes are independent, so run them side by side (latency = max, not sum)
+_HEALTH_PROBE_TIMEOUT = 2.0
+_health_pool = concurrent.futures.ThreadPoolExecutor(
+    max_workers=3, thread_name_prefix="health"
+)
+
+
+def _probe_firebase():
+    """Check that the Firestore client was set up by init_firebase()."""
+    firebase_ok = firebase_config.db is not None
+    if not firebase_ok:
+        return "firebase", "unhealthy", RuntimeError("Firestore client is None")
+    return "firebase", "healthy", None
+
+
+def _probe_gemini():
+    """Check that both Gemini models were set up by init_gemini()."""
+    gemini_ok = llm_service.base_llm is not None and llm_service.advance_llm is not None
+    if not gemini_ok:
+        return "gemini_api", "unhealthy", RuntimeError("LLM models not initialized")
+    return "gemini_api", "healthy", None
+
+
+def _probe_config():
+    """Check that critical configuration is present."""
+    try:
+        if not Config.GEMINI_API_KEY:
+            raise ValueError("Missing critical configuration")
+        return "config", "healthy", None
+    except Exception as e:
+        return "config", "unhealthy", e
+
+
+def _static_body(payload):
+    """Serialize a constant JSON payload once at import time."""
+    return json.dumps(payload, separators=(",", ":"))
+
+
+# Constant response bodies, keyed by status code. A fresh Response object is
+# still built per request; only the serialization is done up front.
+_STATIC_ERROR_BODIES = {
+    400: _static_body(
+        {
+            "success": False,
+            "error_code": "BAD_REQUEST",
+            "message": "The request could not be understood by the server",
+        }
+    ),
+    401: _static_body(
+        {
+            "success": False,
+            "error_code": "AUTHENTICATION_ERROR",
+            "message": "Authentication required",
+        }
+    ),
+    403: _static_body(
+        {
+            "success": False,
+            "error_code": "AUTHORIZATION_ERROR",
+            "message": "Access denied",
+        }
+    ),
+    404: _static_body(
+        {
+            "success": False,
+            "error_code": "NOT_FOUND",
+            "message": "The requested resource was not found",
+        }
+    ),
+    413: _static_body(
+        {
+            "success": False,
+            "error_code": "PAYLOAD_TOO_LARGE",
+            "message": (
+                f"Request body must be {Config.MAX_CONTENT_LENGTH // 1024}KB or less"
+            ),
+        }
+    ),
+}
+
+_API_ROOT_BODY = _static_body(
+    {
+        "message": "Welcome to StressEase Backend API",
+        "version": "1.0.0",
+        "endpoints": {
+            "mood": "/api/mood",
+            "chat": "/api/chat",
+            "predict": "/api/predict",
+            "analytics": "/api/analytics",
+        },
+    }
+)
+
+# Liveness only proves the process is serving requests, so the body is constant
+_LIVE_RESPONSE = ('{"status":"ok"}', 200)
+
+_HEALTH_PROBES = {
+    "firebase": _probe_firebase,
+    "gemini_api": _probe_gemini,
+    "config": _probe_config,
+}
+
+
 def create_app():
     """
     Application factory function that creates and configures the Flask app.
@@ -18,6 +138,11 @@ def create_app():
     # Create Flask application instance
     app = Flask(__name__)
 
+    # Serialize JSON responses with orjson; compact and unsorted output
+    app.json = OrjsonProvider(app)
+    app.json.sort_keys = False
+    app.json.compact = True
+
     # Load configuration
     app.config.from_object(Config)
 
@@ -53,61 +178,43 @@ def create_app():
     app.register_blueprint(predict_bp, url_prefix="/api")
     app.register_blueprint(analytics_bp, url_prefix="/api/analytics")
 
+    def static_json(body, status):
+        return app.response_class(body, status=status, mimetype="application/json")
+
     # Global error handlers
     @app.errorhandler(400)
     def bad_request(error):
         logger.warning(f"Bad request: {error}")
-        return (
-            jsonify(
-                {
-                    "success": False,
-                    "error_code": "BAD_REQUEST",
-                    "message": "The request could not be understood by the server",
-                }
-            ),
-            400,
-        )
+        return static_json(_STATIC_ERROR_BODIES[400], 400)
 
     @app.errorhandler(401)
     def unauthorized(error):
         logger.warning(f"Unauthorized access attempt: {error}")
-        return (
-            jsonify(
-                {
-                    "success": False,
-                    "error_code": "AUTHENTICATION_ERROR",
-                    "message": "Authentication required",
-                }
-            ),
-            401,
-        )
+        return static_json(_STATIC_ERROR_BODIES[401], 401)
 
     @app.errorhandler(403)
     def forbidden(error):
         logger.warning(f"Forbidden access: {error}")
-        return (
-            jsonify(
-                {
-                    "success": False,
-                    "error_code": "AUTHORIZATION_ERROR",
-                    "message": "Access denied",
-                }
-            ),
-            403,
-        )
+        return static_json(_STATIC_ERROR_BODIES[403], 403)
 
     @app.errorhandler(404)
     def not_found(error):
-        return (
-            jsonify(
-                {
-                    "success": False,
-                    "error_code": "NOT_FOUND",
-                    "message": "The requested resource was not found",
-                }
-            ),
-            404,
-        )
+        return static_json(_STATIC_ERROR_BODIES[404], 404)
+
+    @app.errorhandler(413)
+    def payload_too_large(error):
+        logger.warning(f"Payload too large: {error}")
+        return static_json(_STATIC_ERROR_BODIES[413], 413)
+
+    # Views read the body inside their own try blocks, where Werkzeug's 413
+    # would become a 500; reject declared oversized bodies before routing
+    @app.before_request
+    def reject_oversized_body():
+        if (
+            request.content_length
+            and request.content_length > app.config["MAX_CONTENT_LENGTH"]
+        ):
+            abort(413)
 
     @app.errorhandler(500)
     def internal_error(error):
@@ -123,8 +230,14 @@ def create_app():
             500,
         )
 
-    # Health check endpoint
+    # Liveness endpoint (no service checks)
+    @app.route("/livez")
+    def liveness_check():
+        return static_json(*_LIVE_RESPONSE)
+
+    # Health check / readiness endpoint
     @app.route("/health")
+    @app.route("/readyz")
     def health_check():
         """
         Health check endpoint that actually tests service availability.
@@ -133,79 +246,53 @@ def create_app():
             200 OK if all services are healthy
             503 Service Unavailable if any critical service is down
         """
+        now = time.monotonic()
+        with _health_lock:
+            cached = dict(_health_cache)
+        if now - cached["ts"] < _HEALTH_TTL and cached["payload"]:
+            return jsonify(cached["payload"]), 200
+
         health_status = {
             "status": "healthy",
             "services": {},
             "timestamp": datetime.utcnow().isoformat() + "Z",
         }
 
-        all_healthy = True
-
-        # Test Firebase connection
-        try:
-            from stressease.services.utility.firebase_config import get_firestore_client
-
-            db = get_firestore_client()
-            # Simple check: ensure db client exists
-            if db is None:
-                raise RuntimeError("Firestore client is None")
-            health_status["services"]["firebase"] = "healthy"
-        except Exception as e:
-            logger.error(f"Firebase health check failed: {e}")
-            health_status["services"]["firebase"] = "unhealthy"
-            all_healthy = False
-
-        # Test Gemini API availability
-        try:
-            from stressease.services.chat.llm_service import (
-                get_base_model,
-                get_advance_model,
-            )
-
-            base_model = get_base_model()
-            advance_model = get_advance_model()
-            if base_model is None or advance_model is None:
-                raise RuntimeError("LLM models not initialized")
-            health_status["services"]["gemini_api"] = "healthy"
-        except Exception as e:
-            logger.error(f"Gemini API health check failed: {e}")
-            health_status["services"]["gemini_api"] = "unhealthy"
-            all_healthy = False
-
-        # Test configuration
-        try:
-            if not Config.GEMINI_API_KEY:
-                raise ValueError("Missing critical configuration")
-            health_status["services"]["config"] = "healthy"
-        except Exception as e:
-            logger.error(f"Configuration health check failed: {e}")
-            health_status["services"]["config"] = "unhealthy"
-            all_healthy = False
+        # Run all probes concurrently; anything still running counts as down
+        futures = {
+            _health_pool.submit(probe): name for name, probe in _HEALTH_PROBES.items()
+        }
+        done, _ = concurrent.futures.wait(futures, timeout=_HEALTH_PROBE_TIMEOUT)
+
+        for future, name in futures.items():
+            if future in done:
+                _, status, error = future.result()
+            else:
+                status, error = "unhealthy", TimeoutError("Health probe timed out")
+
+            health_status["services"][name] = status
+            if error is not None:
+                logger.error(f"{name} health check failed: {error}")
+
+        all_healthy = all(
+            status == "healthy" for status in health_status["services"].values()
+        )
 
         # Set overall status
+        status_code = 200
         if not all_healthy:
             health_status["status"] = "unhealthy"
-            return jsonify(health_status), 503
+            status_code = 503
+
+        if all_healthy:
+            with _health_lock:
+                _health_cache.update(ts=now, payload=health_status)
 
-        return jsonify(health_status), 200
+        return jsonify(health_status), status_code
 
     # API root endpoint
     @app.route("/api")
     def api_root():
-        return (
-            jsonify(
-                {
-                    "message": "Welcome to StressEase Backend API",
-                    "version": "1.0.0",
-                    "endpoints": {
-                        "mood": "/api/mood",
-                        "chat": "/api/chat",
-                        "predict": "/api/predict",
-                        "analytics": "/api/analytics",
-                    },
-                }
-            ),
-            200,
-        )
+        return static_json(_API_ROOT_BODY, 200)
 
     return app
@@ -5,6 +5,7 @@ from stressease.services.utility.auth_service import token_required
 from stressease.services.prediction.analytics_service import (
     fetch_analytics_data,
     calculate_summary,
+    format_summary_for_response,
     analyze_trends,
     generate_prediction,
 )
@@ -15,6 +16,33 @@ logger = logging.getLogger(__name__)
 # Create the analytics blueprint
 analytics_bp = Blueprint("analytics", __name__)
 
+# Static error responses: key -> (http status, error_code, error, message)
+_ERROR_TEMPLATES = {
+    "INSUFFICIENT_DATA": (
+        400,
+        "INSUFFICIENT_DATA",
+        "Insufficient Data",
+        "Please complete at least one daily quiz before viewing analytics",
+    ),
+}
+
+
+def _err(key, **extra):
+    """Build a JSON error response from a static template plus extra fields."""
+    status, error_code, error, message = _ERROR_TEMPLATES[key]
+    return (
+        jsonify(
+            {
+                "success": False,
+                "error_code": error_code,
+                "error": error,
+                "message": message,
+                **extra,
+            }
+        ),
+        status,
+    )
+
 
 @analytics_bp.route("/final-summary", methods=["POST"])
 @token_required
@@ -34,20 +62,12 @@ def final_summary(user_id):
 
         # Edge Case: No data available
         if not data_result["has_data"]:
-            return (
-                jsonify(
-                    {
-                        "success": False,
-                        "error_code": "INSUFFICIENT_DATA",
-                        "error": "Insufficient Data",
-                        "message": "Please complete at least one daily quiz before viewing analytics",
-                        "metadata": {
-                            "days_analyzed": 0,
-                            "data_quality": data_result["data_quality"],
-                        },
-                    }
-                ),
-                400,
+            return _err(
+                "INSUFFICIENT_DATA",
+                metadata={
+                    "days_analyzed": 0,
+                    "data_quality": data_result["data_quality"],
+                },
             )
 
         mood_logs = data_result["mood_logs"]
@@ -65,7 +85,7 @@ def final_summary(user_id):
 
         # Step 5: Build response
         response_data = {
-            "summary": summary,
+            "summary": format_summary_for_response(summary),
             "trends": trends,
             "prediction": prediction,
             "metadata": {"days_analyzed": days_available, "data_quality": data_quality},
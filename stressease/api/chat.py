@@ -2,26 +2,32 @@
 Chat API endpoints with LangChain integration.
 
 This module provides:
-- POST /message - Send chat message with implicit session creation and auto-cleanup
+- POST /message - Send chat message with implicit session creation
 - GET /crisis-resources - Get country-specific crisis resources
 
 Session Management:
-- Max 2 active sessions per user
-- Automatic cleanup of oldest session when limit exceeded
-- Chat history preserved in Firestore
+- In-memory sessions expire after 30 minutes of inactivity
+- Least recently used sessions are evicted when the cache is full
+- Evicted sessions are marked as ended; chat history preserved in Firestore
 """
 
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, current_app, request, jsonify, make_response
 from stressease.services.utility.auth_service import token_required
 from stressease.services.chat import llm_service
 from stressease.services.chat import chat_memory_service
 from stressease.services.mood import mood_service
 from stressease.services.chat import crisis_resource_service
+from stressease.services.sos import get_sos_contacts
 from langchain_core.messages import HumanMessage, AIMessage
 from datetime import datetime
-import uuid
+import cachetools
+import concurrent.futures
+import functools
+import hashlib
 import threading
+import uuid
 import logging
+import pycountry
 
 logger = logging.getLogger(__name__)
 
@@ -30,56 +36,251 @@ logger = logging.getLogger(__name__)
 chat_bp = Blueprint("chat", __name__)
 
 
+# ============================================================================
+# BACKGROUND WORKER POOL
+# ============================================================================
+# Fire-and-forget Firestore writes share one bounded pool instead of spawning
+# a thread per task
+_bg_pool = concurrent.futures.ThreadPoolExecutor(
+    max_workers=8, thread_name_prefix="chat-bg"
+)
+
+
 # ============================================================================
 # IN-MEMORY SESSION CACHE
 # ============================================================================
-# Format: {user_id: {session_id: {'chain': runnable, 'last_activity': timestamp, 'message_count': int}}}
-active_chat_sessions = {}
 
 
-def cleanup_old_sessions(user_id: str, max_sessions: int = 2):
+class _SessionCache(cachetools.TTLCache):
     """
-    Auto-cleanup oldest sessions when user exceeds session limit.
+    TTL + LRU session cache that marks evicted sessions as ended in Firestore.
 
-    Preserves chat history in Firestore, only cleans:
-    - In-memory cache (active_chat_sessions dict)
-    - Session status in Firestore (marks as "ended")
+    Keys are (user_id, session_id) tuples. Chat history is preserved in
+    Firestore; only the in-memory entry and the session status change.
 
-    Args:
-        user_id (str): User ID
-        max_sessions (int): Maximum active sessions per user (default: 2)
+    get() does not remove expired entries, so a session resumed after its
+    TTL is reloaded and re-inserted while its stale entry is still present.
+    The expiry sweep that runs on that insert must not end the session
+    being re-inserted.
     """
-    if user_id not in active_chat_sessions:
-        return
 
-    user_sessions = active_chat_sessions[user_id]
-    session_count = len(user_sessions)
+    _inserting = None
 
-    if session_count >= max_sessions:
-        # Find oldest session by last_activity
-        oldest_session = min(user_sessions.items(), key=lambda x: x[1]["last_activity"])
-        session_id_to_remove = oldest_session[0]
+    def __setitem__(self, key, value, **kwargs):
+        self._inserting = key
+        try:
+            super().__setitem__(key, value, **kwargs)
+        finally:
+            self._inserting = None
 
-        # Remove from memory
-        del active_chat_sessions[user_id][session_id_to_remove]
+    def popitem(self):
+        key, value = super().popitem()
+        _end_evicted_session(key)
+        return key, value
 
-        # Mark as ended in Firestore (preserves messages)
-        threading.Thread(
-            target=chat_memory_service.end_session, args=(user_id, session_id_to_remove)
-        ).start()
+    def expire(self, time=None):
+        expired = super().expire(time)
+        for key, _ in expired:
+            if key != self._inserting:
+                _end_evicted_session(key)
+        return expired
 
-        logger.info(
-            f"Auto-cleanup: Removed oldest session for user",
-            extra={"user_id": user_id, "session_id": session_id_to_remove[:8]},
-        )
+
+def _end_evicted_session(key):
+    """Mark an evicted session as ended in Firestore (async in background)."""
+    user_id, session_id = key
+    _bg_pool.submit(chat_memory_service.end_session, user_id, session_id)
+    logger.info(
+        "Evicted chat session from cache",
+        extra={"user_id": user_id, "session_id": session_id[:8]},
+    )
+
+
+# Format: {(user_id, session_id): {'history': [messages], 'last_activity': timestamp, 'message_count': int}}
+active_chat_sessions = _SessionCache(maxsize=1024, ttl=1800)
+
+# cachetools caches are not thread-safe; guards every access to the cache
+# and to the cached session entries
+_sessions_lock = threading.Lock()
+
+# Max LangChain messages kept in a cached session history
+MAX_CACHED_HISTORY = 50
+
+# Firestore message role -> LangChain message class
+_ROLE_CLS = {"user": HumanMessage, "assistant": AIMessage, "ai": AIMessage}
+
+# Mood log fields read by llm_service.summarize_mood_logs
+_MOOD_SUMMARY_FIELDS = ["date", "core_scores", "dass_today", "additional_notes"]
+
+# One personalized chain per user, shared by all of the user's sessions.
+# Format: {user_id: runnable}
+_user_chain_cache = cachetools.TTLCache(maxsize=1024, ttl=900)
+_user_chain_lock = threading.Lock()
+
+# Striped per-user locks so concurrent requests from one user build the
+# chain and load a cold session only once. A fixed set of stripes keeps
+# memory bounded; users sharing a stripe only serialize their cold loads.
+# Reentrant because the cold-session load also builds the chain.
+_USER_LOCK_STRIPES = 64
+_user_locks = tuple(threading.RLock() for _ in range(_USER_LOCK_STRIPES))
+
+
+def _user_lock(user_id):
+    """Return the lock stripe guarding this user's chain and cold sessions."""
+    return _user_locks[hash(user_id) % _USER_LOCK_STRIPES]
+
+
+# ============================================================================
+# ERROR RESPONSES
+# ============================================================================
+# Static error responses: key -> (http status, error_code, error, message)
+_ERROR_TEMPLATES = {
+    "PAYLOAD_TOO_LARGE": (
+        413,
+        "PAYLOAD_TOO_LARGE",
+        "Request too large",
+        "Request body must be 8KB or less",
+    ),
+    "INVALID_REQUEST": (
+        400,
+        "INVALID_REQUEST",
+        "Invalid request",
+        "JSON data is required",
+    ),
+    "INVALID_MESSAGE": (
+        400,
+        "VALIDATION_ERROR",
+        "Invalid message",
+        "Message must be text",
+    ),
+    "EMPTY_MESSAGE": (
+        400,
+        "VALIDATION_ERROR",
+        "Invalid message",
+        "Message cannot be empty",
+    ),
+    "MESSAGE_TOO_LONG": (
+        400,
+        "VALIDATION_ERROR",
+        "Message too long",
+        "Message must be 1000 characters or less",
+    ),
+    "INVALID_COUNTRY": (
+        400,
+        "VALIDATION_ERROR",
+        "Invalid country",
+        "Country must be 100 characters or less",
+    ),
+    "RATE_LIMITED": (
+        429,
+        "RATE_LIMITED",
+        "Too many requests",
+        "Too many lookups for unrecognized countries, please try again later",
+    ),
+    "SESSION_ERROR": (
+        500,
+        "SERVER_ERROR",
+        "Session error",
+        "Could not initialize chat session",
+    ),
+}
+
+
+def _err(key):
+    """Build a JSON error response from a static template."""
+    status, error_code, error, message = _ERROR_TEMPLATES[key]
+    return (
+        jsonify(
+            {
+                "success": False,
+                "error_code": error_code,
+                "error": error,
+                "message": message,
+            }
+        ),
+        status,
+    )
 
 
 # ============================================================================
 # CRISIS SUPPORT ENDPOINTS
 # ============================================================================
+# Everyday names pycountry does not resolve (or resolves wrongly) on its own.
+# Format: {lowercased alias: canonical name}
+_COUNTRY_ALIASES = {
+    "uk": "United Kingdom",
+    "britain": "United Kingdom",
+    "great britain": "United Kingdom",
+    "england": "United Kingdom",
+    "scotland": "United Kingdom",
+    "wales": "United Kingdom",
+    "northern ireland": "United Kingdom",
+    "usa": "United States",
+    "america": "United States",
+    "uae": "United Arab Emirates",
+    "russia": "Russian Federation",
+    "turkey": "Türkiye",
+    "ivory coast": "Côte d'Ivoire",
+    "cape verde": "Cabo Verde",
+    "brunei": "Brunei Darussalam",
+    "kosovo": "Kosovo",
+    "palestine": "Palestine, State of",
+    "micronesia": "Micronesia, Federated States of",
+    "swaziland": "Eswatini",
+    "burma": "Myanmar",
+    "macedonia": "North Macedonia",
+    "holland": "Netherlands",
+    "vatican": "Holy See (Vatican City State)",
+    "drc": "Congo, The Democratic Republic of the",
+}
+
+# Countries that resolve nowhere are still served (a user in crisis must not
+# get an error), but each user may only trigger a few such uncached
+# SerpApi/LLM lookups per hour. Format: {user_id: lookups}
+MAX_UNKNOWN_COUNTRY_LOOKUPS = 5
+_unknown_country_lookups = cachetools.TTLCache(maxsize=10000, ttl=3600)
+_unknown_country_lock = threading.Lock()
+
+
+@functools.lru_cache(maxsize=1024)
+def _resolve_country(country_lower):
+    """
+    Resolve a lowercased country name or ISO code to its canonical name.
+
+    Tries the alias map, then an exact pycountry lookup (names and ISO
+    3166 codes). Fuzzy matching is deliberately not used: it resolves
+    arbitrary short strings, which would let them skip the unknown-country
+    rate limit.
+
+    Args:
+        country_lower (str): Lowercased, stripped user input
+
+    Returns:
+        str or None: Canonical country name, or None if unknown
+    """
+    if country_lower in _COUNTRY_ALIASES:
+        return _COUNTRY_ALIASES[country_lower]
+    try:
+        return pycountry.countries.lookup(country_lower).name
+    except LookupError:
+        return None
+
+
+def _allow_unknown_country(user_id):
+    """Count an unresolved-country lookup; False once the user is over limit."""
+    with _unknown_country_lock:
+        count = _unknown_country_lookups.get(user_id, 0) + 1
+        _unknown_country_lookups[user_id] = count
+    return count <= MAX_UNKNOWN_COUNTRY_LOOKUPS
 
 
-@chat_bp.route("/crisis-resources", methods=["GET", "POST"])
+# Serialized crisis-resources bodies keyed by lowercased canonical country:
+# {country: (json_body, etag)}
+_resource_response_cache = cachetools.TTLCache(maxsize=256, ttl=3600)
+_resource_response_lock = threading.Lock()
+
+
+@chat_bp.route("/crisis-resources", methods=["GET"])
 @token_required
 def get_crisis_resources(user_id):
     """
@@ -89,6 +290,7 @@ def get_crisis_resources(user_id):
     - Cache TTL: 30 days
     - Returns exactly 5 contacts (1 emergency + 4 mental health)
     - Graceful fallback to cache if search fails
+    - Serialized responses cached in-process per country for 1 hour
 
     Query Parameters:
         country (str): Country name selected from dropdown
@@ -97,8 +299,6 @@ def get_crisis_resources(user_id):
         JSON response with country-specific crisis resources
     """
     try:
-        from stressease.services.sos import get_sos_contacts
-
         # Get country from query parameter
         country = request.args.get("country", "").strip()
 
@@ -106,50 +306,95 @@ def get_crisis_resources(user_id):
         if not country:
             country = "India"
 
-        # Get SOS contacts using intelligent service
-        # This will:
-        # 1. Return cached data if fresh (< 30 days)
-        # 2. Fetch fresh data if stale (>= 30 days)
-        # 3. Fallback to cache if fetch fails
-        resources = get_sos_contacts(country)
-
-        if not resources:
-            # Ultimate fallback - try old LLM method
-            logger.warning(
-                f"SOS service failed for {country}, trying fallback LLM method"
-            )
-            resources = llm_service.find_crisis_resources(country)
-
-            if resources:
-                # Cache the LLM-generated resources
-                crisis_resource_service.cache_crisis_resources(country, resources)
-
-        if not resources:
-            response = jsonify(
+        if len(country) > 100:
+            return _err("INVALID_COUNTRY")
+
+        # Aliases and ISO codes ("uk", "gb", "britain") share one canonical
+        # name, so they share the SOS fetch, the Firestore cache doc and the
+        # response cache entry
+        country_name = _resolve_country(country.lower())
+        is_known = country_name is not None
+        if not is_known:
+            country_name = country
+
+        cache_key = country_name.lower()
+        with _resource_response_lock:
+            cached = _resource_response_cache.get(cache_key)
+
+        if cached is None:
+            if not is_known:
+                logger.warning(
+                    "Unrecognized country for crisis resources",
+                    extra={"country": country, "user_id": user_id},
+                )
+                if not _allow_unknown_country(user_id):
+                    return _err("RATE_LIMITED")
+
+            # Get SOS contacts using intelligent service
+            # This will:
+            # 1. Return cached data if fresh (< 30 days)
+            # 2. Fetch fresh data if stale (>= 30 days)
+            # 3. Fallback to cache if fetch fails
+            resources = get_sos_contacts(country_name)
+
+            if not resources:
+                # Ultimate fallback - try old LLM method
+                logger.warning(
+                    f"SOS service failed for {country_name}, trying fallback LLM method"
+                )
+                resources = llm_service.find_crisis_resources(country_name)
+
+                if resources:
+                    # Cache the LLM-generated resources
+                    crisis_resource_service.cache_crisis_resources(
+                        country_name, resources
+                    )
+
+            if not resources:
+                return (
+                    jsonify(
+                        {
+                            "success": False,
+                            "error_code": "RESOURCE_NOT_FOUND",
+                            "message": (
+                                "Could not find crisis resources for "
+                                f"{country_name}"
+                            ),
+                        }
+                    ),
+                    404,
+                )
+
+            # Determine source for transparency
+            cached_at = resources.get("cached_at")
+            source_type = "cache" if cached_at else "generated"
+
+            # ETag changes whenever the cached resources are refreshed
+            etag_input = f"{country_name}:{resources.get('cached_at', '')}"
+            etag = hashlib.blake2b(etag_input.encode(), digest_size=8).hexdigest()
+
+            body = current_app.json.dumps(
                 {
-                    "success": False,
-                    "error_code": "RESOURCE_NOT_FOUND",
-                    "message": f"Could not find crisis resources for {country}",
+                    "success": True,
+                    "message": f"Crisis resources retrieved successfully",
+                    "resources": resources,
+                    "source": source_type,
                 }
             )
-            response.headers["Content-Type"] = "application/json; charset=utf-8"
-            return response, 404
+            cached = (body, etag)
+            with _resource_response_lock:
+                _resource_response_cache[cache_key] = cached
 
-        # Determine source for transparency
-        cached_at = resources.get("cached_at")
-        source_type = "cache" if cached_at else "generated"
+        body, etag = cached
+        if etag in request.if_none_match:
+            response = make_response("", 304)
+        else:
+            # Return the resources
+            response = current_app.response_class(body, mimetype="application/json")
 
-        # Return the resources
-        response = jsonify(
-            {
-                "success": True,
-                "message": f"Crisis resources retrieved successfully",
-                "resources": resources,
-                "source": source_type,
-            }
-        )
-        response.headers["Content-Type"] = "application/json; charset=utf-8"
-        return response, 200
+        response.set_etag(etag)
+        response.headers["Cache-Control"] = "public, max-age=86400"
+        return response
 
     except Exception as e:
         logger.error(
@@ -157,15 +402,16 @@ def get_crisis_resources(user_id):
             extra={"country": country},
             exc_info=True,
         )
-        response = jsonify(
-            {
-                "success": False,
-                "error_code": "SERVER_ERROR",
-                "message": f"Error retrieving crisis resources: {str(e)}",
-            }
+        return (
+            jsonify(
+                {
+                    "success": False,
+                    "error_code": "SERVER_ERROR",
+                    "message": f"Error retrieving crisis resources: {str(e)}",
+                }
+            ),
+            500,
         )
-        response.headers["Content-Type"] = "application/json; charset=utf-8"
-        return response, 500
 
 
 # ============================================================================
@@ -189,38 +435,32 @@ def send_chat_message(user_id):
         JSON response with AI reply and session_id
     """
     try:
-        # Get and validate JSON data
-        message_data = request.get_json()
-        if not message_data:
-            return (
-                jsonify(
-                    {
-                        "success": False,
-                        "error_code": "INVALID_REQUEST",
-                        "error": "Invalid request",
-                        "message": "JSON data is required",
-                    }
-                ),
-                400,
-            )
+        # Reject oversized bodies before reading them
+        if request.content_length and request.content_length > 8192:
+            return _err("PAYLOAD_TOO_LARGE")
+
+        # Get and validate JSON data (malformed JSON yields None)
+        message_data = request.get_json(silent=True)
+        if not message_data or not isinstance(message_data, dict):
+            return _err("INVALID_REQUEST")
 
         # Extract and validate message
-        user_message = message_data.get("message", "").strip()
+        # Check the raw value first so oversized payloads are rejected
+        # before any copy is made
+        raw_message = message_data.get("message", "")
+        if not isinstance(raw_message, str):
+            return _err("INVALID_MESSAGE")
+        if len(raw_message) > 4096:
+            return _err("MESSAGE_TOO_LONG")
+
+        user_message = raw_message
+        if raw_message and (raw_message[0].isspace() or raw_message[-1].isspace()):
+            user_message = raw_message.strip()
         session_id = message_data.get("session_id")
 
         # Input validation
         if not user_message:
-            return (
-                jsonify(
-                    {
-                        "success": False,
-                        "error_code": "VALIDATION_ERROR",
-                        "error": "Invalid message",
-                        "message": "Message cannot be empty",
-                    }
-                ),
-                400,
-            )
+            return _err("EMPTY_MESSAGE")
 
         # Block gibberish (messages without any letters)
         # TEMPORARILY DISABLED FOR TESTING - See how LLM handles gibberish
@@ -237,17 +477,11 @@ def send_chat_message(user_id):
         #     )
 
         if len(user_message) > 1000:
-            return (
-                jsonify(
-                    {
-                        "success": False,
-                        "error_code": "VALIDATION_ERROR",
-                        "error": "Message too long",
-                        "message": "Message must be 1000 characters or less",
-                    }
-                ),
-                400,
-            )
+            return _err("MESSAGE_TOO_LONG")
+
+        # Single timestamp for the whole exchange
+        now = datetime.utcnow()
+        ts_iso = now.isoformat()
 
         # Get session data (chain and history)
         session_id, chain, history_messages = _load_session(session_id, user_id)
@@ -257,17 +491,7 @@ def send_chat_message(user_id):
                 f"Failed to initialize chat session",
                 extra={"user_id": user_id, "session_id": session_id},
             )
-            return (
-                jsonify(
-                    {
-                        "success": False,
-                        "error_code": "SERVER_ERROR",
-                        "error": "Session error",
-                        "message": "Could not initialize chat session",
-                    }
-                ),
-                500,
-            )
+            return _err("SESSION_ERROR")
 
         # Generate AI response using LCEL chain
         # Pass history explicitly as it's stateless
@@ -275,52 +499,53 @@ def send_chat_message(user_id):
             chain, user_message, history_messages
         )
 
-        # Calculate new turn number
+        # Take the turn number from the cached message count, then append
+        # the new turn to the cached history. Falls back to the history
+        # length if the session was evicted while the LLM was running.
         turn_number = len(history_messages) // 2
-
-        # Save conversation turn to Firestore (async in background)
-        threading.Thread(
-            target=chat_memory_service.save_conversation_turn,
-            args=(user_id, session_id, user_message, ai_response, turn_number),
-        ).start()
-
-        # Update session activity (async in background)
-        threading.Thread(
-            target=chat_memory_service.update_session_activity,
-            args=(user_id, session_id),
-        ).start()
-
-        # Update message count in cache
-        if (
-            user_id in active_chat_sessions
-            and session_id in active_chat_sessions[user_id]
-        ):
-            active_chat_sessions[user_id][session_id]["message_count"] += 1
-            active_chat_sessions[user_id][session_id][
-                "last_activity"
-            ] = datetime.utcnow()
+        msg_count = turn_number + 1
+        with _sessions_lock:
+            session = active_chat_sessions.get((user_id, session_id))
+            if session is not None:
+                turn_number = session["message_count"]
+                session["message_count"] = msg_count = turn_number + 1
+                history = session["history"]
+                history.append(HumanMessage(content=user_message))
+                history.append(AIMessage(content=ai_response))
+                del history[:-MAX_CACHED_HISTORY]
+                session["last_activity"] = now
+                # Re-insert to refresh the entry's TTL
+                active_chat_sessions[(user_id, session_id)] = session
+
+        # Save conversation turn and update session activity in one
+        # batched Firestore write (async in background)
+        _bg_pool.submit(
+            chat_memory_service.save_turn_and_touch,
+            user_id,
+            session_id,
+            user_message,
+            ai_response,
+            turn_number,
+        )
 
         # Return response
-        timestamp = datetime.utcnow().isoformat()
         return (
             jsonify(
                 {
                     "success": True,
                     "user_message": {
                         "content": user_message,
-                        "timestamp": timestamp,
+                        "timestamp": ts_iso,
                         "role": "user",
                     },
                     "ai_response": {
                         "content": ai_response,
-                        "timestamp": timestamp,
+                        "timestamp": ts_iso,
                         "role": "assistant",
                     },
                     "session_id": session_id,
                     "metadata": {
-                        "message_count": active_chat_sessions.get(user_id, {})
-                        .get(session_id, {})
-                        .get("message_count", 0),
+                        "message_count": msg_count,
                     },
                 }
             ),
@@ -363,73 +588,64 @@ def _load_session(session_id, user_id):
         tuple: (session_id, chain, history_messages)
     """
     try:
-        # Initialize user's session dictionary if it doesn't exist
-        if user_id not in active_chat_sessions:
-            active_chat_sessions[user_id] = {}
-
         # Case 1: No session_id provided - create new session
         if not session_id:
             session_id = str(uuid.uuid4())
 
-            # Auto-cleanup if user has too many active sessions
-            cleanup_old_sessions(user_id, max_sessions=2)
-
             # Create session metadata in Firestore (async)
-            threading.Thread(
-                target=chat_memory_service.create_session_metadata,
-                args=(user_id, session_id),
-            ).start()
+            _bg_pool.submit(
+                chat_memory_service.create_session_metadata, user_id, session_id
+            )
 
-            # Create fresh chain
-            chain = _create_chain_for_user(user_id)
+            chain = _get_user_chain(user_id)
 
             # Store in cache
-            active_chat_sessions[user_id][session_id] = {
-                "chain": chain,
-                "last_activity": datetime.utcnow(),
-                "message_count": 0,
-            }
+            with _sessions_lock:
+                active_chat_sessions[(user_id, session_id)] = {
+                    "history": [],
+                    "last_activity": datetime.utcnow(),
+                    "message_count": 0,
+                }
 
             return session_id, chain, []
 
         # Case 2: Session_id provided
 
-        # Load history from Firestore (always load fresh history to be safe)
-        # We convert the raw dicts to LangChain Message objects
-        raw_messages = chat_memory_service.load_conversation_memory(
-            user_id, session_id, max_messages=25
-        )
-        history_messages = []
-
-        for msg in raw_messages:
-            # Assuming msg has 'role' and 'content' or similar structure from load_conversation_memory
-            # We need to adapt based on what chat_memory_service returns
-            # If it returns LangChain messages, great. If dicts, we convert.
-            if isinstance(msg, HumanMessage) or isinstance(msg, AIMessage):
-                history_messages.append(msg)
-            elif isinstance(msg, dict):
-                # Adapt based on your Firestore structure
-                role = msg.get("role") or msg.get("type")
-                content = msg.get("content") or msg.get("text")
-                if role == "user":
-                    history_messages.append(HumanMessage(content=content))
-                elif role == "assistant" or role == "ai":
-                    history_messages.append(AIMessage(content=content))
-
-        # Check cache for existing chain
-        if session_id in active_chat_sessions[user_id]:
-            chain = active_chat_sessions[user_id][session_id]["chain"]
-            return session_id, chain, history_messages
-
-        # If not in cache, create new chain
-        chain = _create_chain_for_user(user_id)
-
-        # Store in cache
-        active_chat_sessions[user_id][session_id] = {
-            "chain": chain,
-            "last_activity": datetime.utcnow(),
-            "message_count": len(history_messages) // 2,
-        }
+        # Cache hit - history is kept up to date in memory, skip Firestore
+        with _sessions_lock:
+            session = active_chat_sessions.get((user_id, session_id))
+            history_messages = list(session["history"]) if session else None
+        if history_messages is not None:
+            return session_id, _get_user_chain(user_id), history_messages
+
+        with _user_lock(user_id):
+            # Another request may have loaded the session while we waited
+            with _sessions_lock:
+                session = active_chat_sessions.get((user_id, session_id))
+                history_messages = list(session["history"]) if session else None
+            if history_messages is not None:
+                return session_id, _get_user_chain(user_id), history_messages
+
+            # Cache miss - load history from Firestore
+            # We convert the raw dicts to LangChain Message objects
+            raw_messages = chat_memory_service.load_conversation_memory(
+                user_id, session_id, max_messages=25
+            )
+            history_messages = [
+                _ROLE_CLS[m["role"]](content=m["content"])
+                for m in raw_messages
+                if m.get("role") in _ROLE_CLS
+            ]
+
+            chain = _get_user_chain(user_id)
+
+            # Store in cache
+            with _sessions_lock:
+                active_chat_sessions[(user_id, session_id)] = {
+                    "history": list(history_messages),
+                    "last_activity": datetime.utcnow(),
+                    "message_count": len(history_messages) // 2,
+                }
 
         return session_id, chain, history_messages
 
@@ -442,13 +658,41 @@ def _load_session(session_id, user_id):
         return None, None, []
 
 
+def _get_user_chain(user_id):
+    """
+    Return the user's cached LCEL chain, creating it on a cache miss.
+
+    Args:
+        user_id (str): User ID from authentication
+
+    Returns:
+        Runnable: Personalized conversation chain
+    """
+    with _user_chain_lock:
+        chain = _user_chain_cache.get(user_id)
+    if chain is not None:
+        return chain
+
+    with _user_lock(user_id):
+        # Double-check: a concurrent request may have built it already
+        with _user_chain_lock:
+            chain = _user_chain_cache.get(user_id)
+        if chain is None:
+            chain = _create_chain_for_user(user_id)
+            with _user_chain_lock:
+                _user_chain_cache[user_id] = chain
+    return chain
+
+
 def _create_chain_for_user(user_id):
     """
     Helper to create a personalized LCEL chain for a user.
     """
     # Fetch user context
     user_profile = chat_memory_service.get_user_profile(user_id)
-    mood_logs = mood_service.get_last_daily_mood_logs(user_id, limit=7)
+    mood_logs = mood_service.get_last_daily_mood_logs(
+        user_id, limit=7, fields=_MOOD_SUMMARY_FIELDS
+    )
 
     # Generate mood summary if logs exist
     mood_summary = ""
@@ -6,11 +6,11 @@ from stressease.services.mood.mood_service import (
     upsert_daily_mood_log,
     get_last_daily_mood_logs,
     get_daily_mood_logs_count,
-    weekly_dass_exists,
     save_weekly_dass_totals,
     get_daily_mood_log_by_date,
     get_daily_questions,
 )
+from stressease.services.prediction.analytics_service import invalidate_analytics_data
 from datetime import datetime, date
 import logging
 
@@ -19,6 +19,15 @@ logger = logging.getLogger(__name__)
 # Create the mood blueprint
 mood_bp = Blueprint("mood", __name__)
 
+# Mood log fields read by the weekly DASS aggregation
+_WEEKLY_DASS_FIELDS = [
+    "date",
+    "submitted_at",
+    "dass_today",
+    "core_scores",
+    "rotating_scores",
+]
+
 
 # ******************************************************************************
 # * POST /api/mood/quiz/daily - Submit structured daily mood quiz
@@ -39,7 +48,8 @@ def submit_daily_quiz(user_id):
     }
 
     Returns:
-      { success, log_id, high_point, low_point, maybe weekly_dass if computed }
+      { success, log_id, high_point, low_point, maybe weekly_dass if computed,
+        insights_status ("queued" or "unavailable") }
     """
     try:
         payload = request.get_json()
@@ -247,12 +257,18 @@ def submit_daily_quiz(user_id):
 
         log_id = result["doc_id"]
         quiz_date = result["date"]
+        # The upsert defaults a missing date to today; insights need the
+        # date actually stored
+        daily_doc["date"] = quiz_date
+
+        # Drop this worker's now-stale analytics entries (other workers
+        # pick up the new log once their short-lived entries expire)
+        invalidate_analytics_data(user_id)
 
         # Generate AI insights from today's quiz data with context-aware enrichment
+        insights_status = "unavailable"
         try:
-            from stressease.services.ai_insight.ai_insight_service import (
-                generate_ai_insights,
-            )
+            from stressease.services.ai_insight import enqueue_ai_insights
 
             # Extract day_key from payload (default to "day_1" if missing)
             day_key = payload.get("day_key", "day_1")
@@ -323,21 +339,18 @@ def submit_daily_quiz(user_id):
             else:
                 logger.warning(f"No questions found for {day_key}, using scores only")
 
-            # Pass the enriched quiz data to insights generation
-            insights_result = generate_ai_insights(user_id, daily_doc)
-            if insights_result:
-                logger.info(
-                    f"AI insights generated for user",
-                    extra={"user_id": user_id, "date": quiz_date},
-                )
-            else:
-                logger.warning(
-                    f"AI insights generation failed", extra={"user_id": user_id}
-                )
+            # Generate insights in the background; the client reads them from
+            # users/{uid}/ai_insights/latest once they are saved
+            enqueue_ai_insights(user_id, daily_doc)
+            insights_status = "queued"
+            logger.info(
+                f"AI insights queued for user",
+                extra={"user_id": user_id, "date": quiz_date},
+            )
         except Exception as e:
             # Don't fail the quiz submission if insights generation fails
             logger.error(
-                f"Error generating AI insights: {str(e)}",
+                f"Error queueing AI insights: {str(e)}",
                 extra={"user_id": user_id},
                 exc_info=True,
             )
@@ -346,7 +359,7 @@ def submit_daily_quiz(user_id):
         weekly_result = None
         # Only trigger when total count is a multiple of 7 (i.e., end of a 7-day block)
         total_count = get_daily_mood_logs_count(user_id)
-        last_7 = get_last_daily_mood_logs(user_id, 7)
+        last_7 = get_last_daily_mood_logs(user_id, 7, fields=_WEEKLY_DASS_FIELDS)
         if total_count >= 7 and total_count % 7 == 0 and len(last_7) == 7:
             # Extract DASS series
             def _to_dass_scale(score: int) -> int:
@@ -391,58 +404,58 @@ def submit_daily_quiz(user_id):
                 week_start = date.today().isoformat()
                 week_end = week_start
 
-            # Avoid duplicates: only save if a record for this range doesn't exist
-            if not weekly_dass_exists(user_id, week_start, week_end):
-                weekly_id = save_weekly_dass_totals(
-                    user_id,
-                    week_start,
-                    week_end,
-                    depression_total,
-                    anxiety_total,
-                    stress_total,
+            # Idempotent upsert: the document ID is the week range, so a repeat
+            # submission overwrites the same record instead of duplicating it
+            weekly_id = save_weekly_dass_totals(
+                user_id,
+                week_start,
+                week_end,
+                depression_total,
+                anxiety_total,
+                stress_total,
+            )
+            if weekly_id:
+                # Compute optional weekly summary for response (not stored)
+                core_avgs_per_day = []
+                rotating_avgs_per_day = []
+                for entry in last_7:
+                    c = entry.get("core_scores", {})
+                    r = entry.get("rotating_scores", {})
+                    cs = [
+                        c.get("mood", 0),
+                        c.get("energy", 0),
+                        c.get("sleep", 0),
+                        c.get("stress", 0),
+                    ]
+                    rs = r.get("scores", [])
+                    if len(cs) == 4:
+                        core_avgs_per_day.append(sum(cs) / 4)
+                    if isinstance(rs, list) and len(rs) == 5:
+                        rotating_avgs_per_day.append(sum(rs) / 5)
+
+                weekly_core_avg = (
+                    round(sum(core_avgs_per_day) / len(core_avgs_per_day), 2)
+                    if core_avgs_per_day
+                    else None
                 )
-                if weekly_id:
-                    # Compute optional weekly summary for response (not stored)
-                    core_avgs_per_day = []
-                    rotating_avgs_per_day = []
-                    for entry in last_7:
-                        c = entry.get("core_scores", {})
-                        r = entry.get("rotating_scores", {})
-                        cs = [
-                            c.get("mood", 0),
-                            c.get("energy", 0),
-                            c.get("sleep", 0),
-                            c.get("stress", 0),
-                        ]
-                        rs = r.get("scores", [])
-                        if len(cs) == 4:
-                            core_avgs_per_day.append(sum(cs) / 4)
-                        if isinstance(rs, list) and len(rs) == 5:
-                            rotating_avgs_per_day.append(sum(rs) / 5)
-
-                    weekly_core_avg = (
-                        round(sum(core_avgs_per_day) / len(core_avgs_per_day), 2)
-                        if core_avgs_per_day
-                        else None
-                    )
-                    weekly_rotating_avg = (
-                        round(
-                            sum(rotating_avgs_per_day) / len(rotating_avgs_per_day), 2
-                        )
-                        if rotating_avgs_per_day
-                        else None
+                weekly_rotating_avg = (
+                    round(
+                        sum(rotating_avgs_per_day) / len(rotating_avgs_per_day), 2
                     )
+                    if rotating_avgs_per_day
+                    else None
+                )
 
-                    weekly_result = {
-                        "weekly_id": weekly_id,
-                        "week_start": week_start,
-                        "week_end": week_end,
-                        "depression_total": depression_total,
-                        "anxiety_total": anxiety_total,
-                        "stress_total": stress_total,
-                        "weekly_core_avg": weekly_core_avg,
-                        "weekly_rotating_avg": weekly_rotating_avg,
-                    }
+                weekly_result = {
+                    "weekly_id": weekly_id,
+                    "week_start": week_start,
+                    "week_end": week_end,
+                    "depression_total": depression_total,
+                    "anxiety_total": anxiety_total,
+                    "stress_total": stress_total,
+                    "weekly_core_avg": weekly_core_avg,
+                    "weekly_rotating_avg": weekly_rotating_avg,
+                }
 
         return (
             jsonify(
@@ -453,6 +466,7 @@ def submit_daily_quiz(user_id):
                     "high_point": high_point,
                     "low_point": low_point,
                     "weekly_dass": weekly_result,
+                    "insights_status": insights_status,
                 }
             ),
             201,
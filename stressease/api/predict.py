@@ -1,9 +1,10 @@
 """Stress prediction endpoint."""
 
-from flask import Blueprint, request, jsonify
-from typing import Optional, Tuple
+from flask import Blueprint, Response, jsonify, request
+from typing import Any, Callable, Optional, Tuple
 from stressease.services.utility.auth_service import token_required
 from stressease.services.prediction.prediction_service import predict_stress
+from stressease.services.mood.mood_service import get_avg_daily_total_score
 import logging
 
 logger = logging.getLogger(__name__)
@@ -12,6 +13,25 @@ logger = logging.getLogger(__name__)
 predict_bp = Blueprint("predict", __name__)
 
 
+def _json(payload: Any, status: int = 200) -> Response:
+    """
+    Build a JSON response through the app's orjson provider.
+
+    Serializing via jsonify keeps this endpoint's output (datetimes, numpy
+    scalars, key order) identical to every other endpoint.
+
+    Args:
+        payload: JSON-serializable data
+        status: HTTP status code
+
+    Returns:
+        Response with application/json mimetype
+    """
+    response = jsonify(payload)
+    response.status_code = status
+    return response
+
+
 def _calculate_avg_quiz_score(user_id: str) -> Tuple[Optional[float], int]:
     """
     Calculate 7-day average of daily_total_score from Firestore.
@@ -24,28 +44,85 @@ def _calculate_avg_quiz_score(user_id: str) -> Tuple[Optional[float], int]:
             - avg_score: Average quiz score (0-60), or None if no data
             - days_count: Number of days of data available
     """
-    from stressease.services.mood.mood_service import get_last_daily_mood_logs
+    avg, days_count = get_avg_daily_total_score(user_id, limit=7)
 
-    logs = get_last_daily_mood_logs(user_id, limit=7)
-
-    if not logs:
+    if avg is None:
         return None, 0
 
-    # Extract daily_total_score from each log
-    scores = []
-    for log in logs:
-        score = log.get("daily_total_score")
-        if score is not None:
-            scores.append(score)
+    logger.debug("Calculated avgQuizScore: %.2f from %d day(s)", avg, days_count)
+    return round(avg, 2), days_count
 
-    if not scores:
-        return None, 0
 
-    avg = sum(scores) / len(scores)
-    days_count = len(scores)
+def _bounded(
+    value: Any, lo: Any, hi: Any, cast: Callable[[Any], Any], name: str, kind: str
+) -> Tuple[bool, Any]:
+    """
+    Coerce a raw payload value and check it lies within [lo, hi].
 
-    logger.debug(f"Calculated avgQuizScore: {avg:.2f} from {days_count} day(s)")
-    return round(avg, 2), days_count
+    Args:
+        value: Raw value from the request payload
+        lo: Inclusive lower bound
+        hi: Inclusive upper bound
+        cast: Conversion to apply (e.g. float, int)
+        name (str): Payload field name used in the error message
+        kind (str): Type description used in the error message ("a number")
+
+    Returns:
+        Tuple of (ok, value_or_message): the coerced value when ok is True,
+        otherwise the user-facing error message
+    """
+    try:
+        value = cast(value)
+    except (TypeError, ValueError):
+        return False, f"{name} must be {kind} between {lo} and {hi}"
+    if value < lo or value > hi:
+        return False, f"{name} must be between {lo} and {hi}"
+    return True, value
+
+
+def _invalid_input(message: str) -> Response:
+    """Build the 400 response for an out-of-range or malformed metric."""
+    return _json({"success": False, "error": "Invalid Input", "message": message}, 400)
+
+
+def _validate_metrics(
+    avg_mood_score: Any, chat_count: Any
+) -> Tuple[Optional[float], Optional[int], Optional[Response]]:
+    """
+    Validate and coerce avgMoodScore and chatCount from the request payload.
+
+    Args:
+        avg_mood_score: Raw avgMoodScore value
+        chat_count: Raw chatCount value
+
+    Returns:
+        Tuple of (avg_mood_score, chat_count, error_response):
+            - On success the coerced float/int values and None
+            - On failure (None, None, 400 response)
+    """
+    # Validate required fields
+    if avg_mood_score is None or chat_count is None:
+        return None, None, _json(
+            {
+                "success": False,
+                "error_code": "VALIDATION_ERROR",
+                "error": "Missing required fields",
+                "message": "avgMoodScore and chatCount are required",
+            },
+            400,
+        )
+
+    ok, avg_mood_score = _bounded(
+        avg_mood_score, 1.0, 5.0, float, "avgMoodScore", "a number"
+    )
+    if not ok:
+        return None, None, _invalid_input(avg_mood_score)
+
+    ok, chat_count = _bounded(chat_count, 0, 999, int, "chatCount", "an integer")
+    if not ok:
+        return None, None, _invalid_input(chat_count)
+
+    return avg_mood_score, chat_count, None
 
 
 # ******************************************************************************
@@ -82,24 +159,23 @@ def predict(user_id):
     """
     try:
         payload = request.get_json()
-        logger.debug(
-            f"Predict endpoint called",
-            extra={
-                "user_id": user_id,
-                "payload_keys": list(payload.keys()) if payload else [],
-            },
-        )
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "Predict endpoint called",
+                extra={
+                    "user_id": user_id,
+                    "payload_keys": list(payload.keys()) if payload else [],
+                },
+            )
 
         if not payload:
-            return (
-                jsonify(
-                    {
-                        "success": False,
-                        "error_code": "INVALID_REQUEST",
-                        "error": "Invalid request",
-                        "message": "JSON body required",
-                    }
-                ),
+            return _json(
+                {
+                    "success": False,
+                    "error_code": "INVALID_REQUEST",
+                    "error": "Invalid request",
+                    "message": "JSON body required",
+                },
                 400,
             )
 
@@ -110,6 +186,13 @@ def predict(user_id):
             "avgQuizScore"
         )  # Optional, backend will calculate
 
+        # Bad input fails fast, before any Firestore read is issued
+        avg_mood_score, chat_count, error_response = _validate_metrics(
+            avg_mood_score, chat_count
+        )
+        if error_response is not None:
+            return error_response
+
         # Calculate avgQuizScore from backend (source of truth)
         backend_avg_quiz_score, quiz_data_days = _calculate_avg_quiz_score(user_id)
 
@@ -124,7 +207,7 @@ def predict(user_id):
                 diff = abs(frontend_avg_quiz_score - backend_avg_quiz_score)
                 if diff > 0.5:  # Allow small rounding differences
                     logger.warning(
-                        f"Quiz score mismatch",
+                        "Quiz score mismatch",
                         extra={
                             "user_id": user_id,
                             "frontend": frontend_avg_quiz_score,
@@ -135,92 +218,24 @@ def predict(user_id):
         else:
             # Backend calculation failed - fallback to frontend
             if frontend_avg_quiz_score is None:
-                return (
-                    jsonify(
-                        {
-                            "success": False,
-                            "error_code": "INSUFFICIENT_DATA",
-                            "error": "Insufficient Data",
-                            "message": "Please complete at least one daily quiz before requesting predictions",
-                        }
-                    ),
+                return _json(
+                    {
+                        "success": False,
+                        "error_code": "INSUFFICIENT_DATA",
+                        "error": "Insufficient Data",
+                        "message": "Please complete at least one daily quiz before requesting predictions",
+                    },
                     400,
                 )
 
             logger.warning(
-                f"Backend quiz calculation failed, using frontend value",
+                "Backend quiz calculation failed, using frontend value",
                 extra={"user_id": user_id, "frontend_value": frontend_avg_quiz_score},
             )
             avg_quiz_score = frontend_avg_quiz_score
             data_source = "frontend"
             quiz_data_days = 0  # Unknown
 
-        # Validate other required fields (avgQuizScore already calculated above)
-        if avg_mood_score is None or chat_count is None:
-            return (
-                jsonify(
-                    {
-                        "success": False,
-                        "error_code": "VALIDATION_ERROR",
-                        "error": "Missing required fields",
-                        "message": "avgMoodScore and chatCount are required",
-                    }
-                ),
-                400,
-            )
-
-        # Validate avgMoodScore
-        try:
-            avg_mood_score = float(avg_mood_score)
-            if avg_mood_score < 1.0 or avg_mood_score > 5.0:
-                return (
-                    jsonify(
-                        {
-                            "success": False,
-                            "error": "Invalid Input",
-                            "message": "avgMoodScore must be between 1.0 and 5.0",
-                        }
-                    ),
-                    400,
-                )
-        except (TypeError, ValueError):
-            return (
-                jsonify(
-                    {
-                        "success": False,
-                        "error": "Invalid Input",
-                        "message": "avgMoodScore must be a number between 1.0 and 5.0",
-                    }
-                ),
-                400,
-            )
-
-        # Validate chatCount
-        try:
-            chat_count = int(chat_count)
-            if chat_count < 0 or chat_count > 999:
-                return (
-                    jsonify(
-                        {
-                            "success": False,
-                            "error": "Invalid Input",
-                            "message": "chatCount must be between 0 and 999",
-                        }
-                    ),
-                    400,
-                )
-        except (TypeError, ValueError):
-            return (
-                jsonify(
-                    {
-                        "success": False,
-                        "error": "Invalid Input",
-                        "message": "chatCount must be an integer between 0 and 999",
-                    }
-                ),
-                400,
-            )
-
         # Call prediction service
         prediction = predict_stress(avg_mood_score, chat_count, avg_quiz_score)
 
@@ -231,30 +246,27 @@ def predict(user_id):
         }
 
         # Return successful response
-        return (
-            jsonify(
-                {
-                    "success": True,
-                    "prediction": prediction,
-                }
-            ),
+        return _json(
+            {
+                "success": True,
+                "prediction": prediction,
+            },
             200,
         )
 
     except Exception as e:
         logger.error(
-            f"Error in /api/predict: {str(e)}",
+            "Error in /api/predict: %s",
+            e,
             extra={"user_id": user_id},
             exc_info=True,
         )
-        return (
-            jsonify(
-                {
-                    "success": False,
-                    "error_code": "SERVER_ERROR",
-                    "error": "Server error",
-                    "message": str(e),
-                }
-            ),
+        return _json(
+            {
+                "success": False,
+                "error_code": "SERVER_ERROR",
+                "error": "Server error",
+                "message": str(e),
+            },
             500,
         )
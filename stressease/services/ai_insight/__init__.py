@@ -1,8 +1,13 @@
 """AI insights and suggestions service."""
 
 from stressease.services.ai_insight.ai_insight_service import (
+    enqueue_ai_insights,
     generate_ai_insights,
     save_ai_insights_to_firestore,
 )
 
-__all__ = ["generate_ai_insights", "save_ai_insights_to_firestore"]
+__all__ = [
+    "enqueue_ai_insights",
+    "generate_ai_insights",
+    "save_ai_insights_to_firestore",
+]
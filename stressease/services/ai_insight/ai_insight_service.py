@@ -6,13 +6,18 @@ current day's mood quiz data using Google Gemini LLM.
 """
 
 from typing import Dict, List, Optional, Any
-from datetime import datetime
-from pydantic import BaseModel, Field
+import concurrent.futures
+import logging
+import threading
+from pydantic import BaseModel, Field, ValidationError
 from langchain_core.prompts import PromptTemplate
 from langchain_core.output_parsers import PydanticOutputParser
+from firebase_admin.firestore import SERVER_TIMESTAMP
 
 from stressease.services.utility.firebase_config import get_firestore_client
-from stressease.services.chat.llm_service import base_llm
+from stressease.services.chat.llm_service import get_base_model
+
+logger = logging.getLogger(__name__)
 
 
 # ============================================================================
@@ -37,11 +42,95 @@ class AIInsights(BaseModel):
     )
 
 
+# ============================================================================
+# PROMPT AND PARSER (built once at import)
+# ============================================================================
+
+_PARSER = PydanticOutputParser(pydantic_object=AIInsights)
+
+_PROMPT = PromptTemplate(
+    template="""You are a compassionate AI mental health assistant analyzing daily mood quiz data.
+
+Based on today's mood quiz scores, provide personalized insights and suggestions.
+
+**Today's Mood Data:**
+{mood_data}
+
+**Score Interpretation:**
+- 1 = Very Poor/Very Low
+- 2 = Poor/Low
+- 3 = Moderate/Average
+- 4 = Good/High
+- 5 = Excellent/Very High
+
+**Instructions:**
+1. **Dominant Emotion**: Choose the most fitting emotion based on all scores (Happy/Neutral/Sad/Anxious/Stressed/Energetic/Calm/Tired)
+2. **Summary**: Write 2-3 sentences about today's mood state, highlighting key observations
+3. **Motivation Quote**: Create a short, encouraging quote with emoji that resonates with today's mood
+4. **Suggestions**: Provide 3-5 specific, actionable suggestions for today/tomorrow addressing detected issues
+
+**Tone**: Empathetic, supportive, non-clinical. Avoid medical terminology or diagnosis.
+
+{format_instructions}
+
+Generate insights:""",
+    input_variables=["mood_data"],
+    partial_variables={"format_instructions": _PARSER.get_format_instructions()},
+)
+
+# Chain: Prompt → Base LLM → Parser (LCEL), bound once the LLM is initialized
+_chain = None
+_chain_lock = threading.Lock()
+
+
+def _get_insights_chain():
+    """
+    Return the insights chain, building it on first use.
+
+    Raises:
+        RuntimeError: If Gemini models are not initialized
+    """
+    global _chain
+    if _chain is None:
+        with _chain_lock:
+            if _chain is None:
+                _chain = _PROMPT | get_base_model() | _PARSER
+    return _chain
+
+
+# ============================================================================
+# BACKGROUND WORKER POOL
+# ============================================================================
+# Insights generation is a multi-second Gemini round-trip; running it here
+# keeps it off the request thread
+_insights_pool = concurrent.futures.ThreadPoolExecutor(
+    max_workers=4, thread_name_prefix="ai-insights"
+)
+
+
 # ============================================================================
 # MAIN INSIGHTS GENERATION
 # ============================================================================
 
 
+def enqueue_ai_insights(
+    user_id: str, daily_quiz_data: Dict[str, Any]
+) -> concurrent.futures.Future:
+    """
+    Schedule generate_ai_insights() on the background pool.
+
+    Results are written to users/{userId}/ai_insights/latest when ready.
+
+    Args:
+        user_id (str): Firebase Auth user ID
+        daily_quiz_data (dict): Current day's quiz data with core_scores, dass_today, etc.
+
+    Returns:
+        Future: Resolves to the insights dict, or None if generation fails
+    """
+    return _insights_pool.submit(generate_ai_insights, user_id, daily_quiz_data)
+
+
 def generate_ai_insights(
     user_id: str, daily_quiz_data: Dict[str, Any]
 ) -> Optional[Dict[str, Any]]:
@@ -60,25 +149,25 @@ def generate_ai_insights(
         insights = analyze_daily_mood(daily_quiz_data)
 
         if not insights:
-            print(f"⚠ LLM returned no insights for user {user_id}")
+            logger.warning("LLM returned no insights for user %s", user_id)
             return None
 
         # Validate structure
         if not _validate_insights_structure(insights):
-            print(f"⚠ Invalid insights structure for user {user_id}")
+            logger.warning("Invalid insights structure for user %s", user_id)
             return None
 
         # Save to Firestore
         success = save_ai_insights_to_firestore(user_id, insights)
 
         if not success:
-            print(f"⚠ Failed to save insights to Firestore for user {user_id}")
+            logger.warning("Failed to save insights to Firestore for user %s", user_id)
             return None
 
         return insights
 
     except Exception as e:
-        print(f"✗ Error generating AI insights for user {user_id}: {str(e)}")
+        logger.error("Error generating AI insights for user %s: %s", user_id, e)
         return None
 
 
@@ -94,58 +183,20 @@ def analyze_daily_mood(quiz_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
     Returns:
         Optional[Dict]: Insights dictionary or None if analysis fails
     """
-    if base_llm is None:
-        raise RuntimeError("Gemini models not initialized. Call init_gemini() first.")
+    chain = _get_insights_chain()
 
     try:
-        # Create Pydantic output parser
-        parser = PydanticOutputParser(pydantic_object=AIInsights)
-
-        # Build prompt with daily quiz data
-        prompt_template = PromptTemplate(
-            template="""You are a compassionate AI mental health assistant analyzing daily mood quiz data.
-
-Based on today's mood quiz scores, provide personalized insights and suggestions.
-
-**Today's Mood Data:**
-{mood_data}
-
-**Score Interpretation:**
-- 1 = Very Poor/Very Low
-- 2 = Poor/Low
-- 3 = Moderate/Average
-- 4 = Good/High
-- 5 = Excellent/Very High
-
-**Instructions:**
-1. **Dominant Emotion**: Choose the most fitting emotion based on all scores (Happy/Neutral/Sad/Anxious/Stressed/Energetic/Calm/Tired)
-2. **Summary**: Write 2-3 sentences about today's mood state, highlighting key observations
-3. **Motivation Quote**: Create a short, encouraging quote with emoji that resonates with today's mood
-4. **Suggestions**: Provide 3-5 specific, actionable suggestions for today/tomorrow addressing detected issues
-
-**Tone**: Empathetic, supportive, non-clinical. Avoid medical terminology or diagnosis.
-
-{format_instructions}
-
-Generate insights:""",
-            input_variables=["mood_data"],
-            partial_variables={"format_instructions": parser.get_format_instructions()},
-        )
-
         # Format the quiz data for the prompt
         mood_data_text = _build_daily_prompt(quiz_data)
 
-        # Chain: Prompt → Base LLM → Parser (LCEL)
-        chain = prompt_template | base_llm | parser
-
         # Execute chain
         insights_model = chain.invoke({"mood_data": mood_data_text})
 
         # Convert Pydantic model to dict
-        return insights_model.dict()
+        return insights_model.model_dump()
 
     except Exception as e:
-        print(f"Error analyzing daily mood: {str(e)}")
+        logger.error("Error analyzing daily mood: %s", e)
         return None
 
 
@@ -163,15 +214,6 @@ def save_ai_insights_to_firestore(user_id: str, insights: Dict[str, Any]) -> boo
     db = get_firestore_client()
 
     try:
-        # Add metadata
-        insights_doc = {
-            "dominant_emotion": insights["dominant_emotion"],
-            "summary": insights["summary"],
-            "motivation_quote": insights["motivation_quote"],
-            "suggestions": insights["suggestions"],
-            "generated_at": datetime.utcnow(),
-        }
-
         # Write to Firestore (overwrites previous insights)
         doc_ref = (
             db.collection("users")
@@ -179,13 +221,15 @@ def save_ai_insights_to_firestore(user_id: str, insights: Dict[str, Any]) -> boo
             .collection("ai_insights")
             .document("latest")
         )
-        doc_ref.set(insights_doc)
+        # Insights are already validated against AIInsights, so write them
+        # as-is and let Firestore stamp the generation time
+        doc_ref.set({**insights, "generated_at": SERVER_TIMESTAMP})
 
-        print(f"✓ AI insights saved to Firestore for user {user_id}")
+        logger.info("AI insights saved to Firestore for user %s", user_id)
         return True
 
     except Exception as e:
-        print(f"✗ Error saving insights to Firestore for user {user_id}: {str(e)}")
+        logger.error("Error saving insights to Firestore for user %s: %s", user_id, e)
         return False
 
 
@@ -193,6 +237,15 @@ def save_ai_insights_to_firestore(user_id: str, insights: Dict[str, Any]) -> boo
 # HELPER FUNCTIONS
 # ============================================================================
 
+# Numeric quiz score -> descriptive label
+_SCORE_LABELS = {
+    1: "Very Poor/Very Low",
+    2: "Poor/Low",
+    3: "Moderate/Average",
+    4: "Good/High",
+    5: "Excellent/Very High",
+}
+
 
 def _build_daily_prompt(quiz_data: Dict[str, Any]) -> str:
     """
@@ -206,72 +259,56 @@ def _build_daily_prompt(quiz_data: Dict[str, Any]) -> str:
     Returns:
         str: Formatted mood data text
     """
-    lines = []
-
-    # Date
-    date = quiz_data.get("date", "Unknown")
-    lines.append(f"Date: {date}")
+    parts = [f"Date: {quiz_data.get('date', 'Unknown')}"]
 
     # Check if we have enriched Q&A data
     enriched_qa = quiz_data.get("enriched_qa", [])
 
     if enriched_qa:
         # Use enriched Q&A format for better context
-        lines.append("\n**Today's Quiz Responses (Question & Answer):**\n")
-
-        # Group by dimension for better readability
-        core_qa = [qa for qa in enriched_qa if qa.get("dimension") == "core"]
-        rotating_qa = [qa for qa in enriched_qa if qa.get("dimension") == "rotating"]
-        dass_qa = [qa for qa in enriched_qa if qa.get("dimension") == "dass"]
-
-        if core_qa:
-            lines.append("**Core Well-being:**")
-            for qa in core_qa:
-                score = qa.get("score", 0)
-                question = qa.get("question", "")
-                score_label = _get_score_label(score)
-                lines.append(f"  Q: {question}")
-                lines.append(f"  A: {score}/5 ({score_label})")
-                lines.append("")
-
-        if rotating_qa:
-            domain = rotating_qa[0].get("domain", "Life Area")
-            lines.append(f"**{domain.capitalize()} Domain:**")
-            for qa in rotating_qa:
-                score = qa.get("score", 0)
-                question = qa.get("question", "")
-                score_label = _get_score_label(score)
-                lines.append(f"  Q: {question}")
-                lines.append(f"  A: {score}/5 ({score_label})")
-                lines.append("")
-
-        if dass_qa:
-            lines.append("**Mental Health Indicators (DASS-21):**")
-            for qa in dass_qa:
-                score = qa.get("score", 0)
-                question = qa.get("question", "")
-                score_label = _get_score_label(score)
-                lines.append(f"  Q: {question}")
-                lines.append(f"  A: {score}/5 ({score_label})")
-                lines.append("")
+        parts.append("\n**Today's Quiz Responses (Question & Answer):**\n")
+
+        # Group by dimension for better readability (single pass)
+        groups = {"core": [], "rotating": [], "dass": []}
+        for qa in enriched_qa:
+            group = groups.get(qa.get("dimension"))
+            if group is not None:
+                group.append(qa)
+
+        if groups["core"]:
+            parts.append("**Core Well-being:**")
+            parts.append(_format_qa_block(groups["core"]))
+
+        if groups["rotating"]:
+            domain = groups["rotating"][0].get("domain", "Life Area")
+            parts.append(f"**{domain.capitalize()} Domain:**")
+            parts.append(_format_qa_block(groups["rotating"]))
+
+        if groups["dass"]:
+            parts.append("**Mental Health Indicators (DASS-21):**")
+            parts.append(_format_qa_block(groups["dass"]))
     else:
         # Fallback to original score-only format
         # Core scores
         core = quiz_data.get("core_scores", {})
         if core:
-            lines.append(f"\nCore Metrics:")
-            lines.append(f"  - Mood: {core.get('mood', 'N/A')}/5")
-            lines.append(f"  - Energy: {core.get('energy', 'N/A')}/5")
-            lines.append(f"  - Sleep Quality: {core.get('sleep', 'N/A')}/5")
-            lines.append(f"  - Stress Level: {core.get('stress', 'N/A')}/5")
+            parts.append(
+                "\nCore Metrics:\n"
+                f"  - Mood: {core.get('mood', 'N/A')}/5\n"
+                f"  - Energy: {core.get('energy', 'N/A')}/5\n"
+                f"  - Sleep Quality: {core.get('sleep', 'N/A')}/5\n"
+                f"  - Stress Level: {core.get('stress', 'N/A')}/5"
+            )
 
         # DASS scores
         dass = quiz_data.get("dass_today", {})
         if dass:
-            lines.append(f"\nMental Health Indicators (DASS-21):")
-            lines.append(f"  - Depression: {dass.get('depression', 'N/A')}/5")
-            lines.append(f"  - Anxiety: {dass.get('anxiety', 'N/A')}/5")
-            lines.append(f"  - Stress: {dass.get('stress', 'N/A')}/5")
+            parts.append(
+                "\nMental Health Indicators (DASS-21):\n"
+                f"  - Depression: {dass.get('depression', 'N/A')}/5\n"
+                f"  - Anxiety: {dass.get('anxiety', 'N/A')}/5\n"
+                f"  - Stress: {dass.get('stress', 'N/A')}/5"
+            )
 
         # Rotating domain
         rotating = quiz_data.get("rotating_scores", {})
@@ -280,38 +317,37 @@ def _build_daily_prompt(quiz_data: Dict[str, Any]) -> str:
             scores = rotating.get("scores", [])
             if scores:
                 avg_domain = sum(scores) / len(scores)
-                lines.append(f"\n{domain_name.capitalize()} Domain:")
-                lines.append(f"  - Average Score: {avg_domain:.1f}/5")
-                lines.append(f"  - Individual Scores: {scores}")
+                parts.append(
+                    f"\n{domain_name.capitalize()} Domain:\n"
+                    f"  - Average Score: {avg_domain:.1f}/5\n"
+                    f"  - Individual Scores: {scores}"
+                )
 
         # Calculated averages
         core_avg = quiz_data.get("core_avg")
         rotating_avg = quiz_data.get("rotating_avg")
         if core_avg is not None:
-            lines.append(f"\nOverall Core Average: {core_avg:.2f}/5")
+            parts.append(f"\nOverall Core Average: {core_avg:.2f}/5")
         if rotating_avg is not None:
-            lines.append(
+            parts.append(
                 f"Overall {rotating.get('domain_name', 'Domain')} Average: {rotating_avg:.2f}/5"
             )
 
     # Additional notes (always include if present)
     notes = quiz_data.get("additional_notes", "")
     if notes:
-        lines.append(f"\nUser Notes: {notes}")
+        parts.append(f"\nUser Notes: {notes}")
 
-    return "\n".join(lines)
+    return "\n".join(parts)
 
 
-def _get_score_label(score: int) -> str:
-    """Convert numeric score to descriptive label."""
-    labels = {
-        1: "Very Poor/Very Low",
-        2: "Poor/Low",
-        3: "Moderate/Average",
-        4: "Good/High",
-        5: "Excellent/Very High",
-    }
-    return labels.get(score, "Unknown")
+def _format_qa_block(qa_items: List[Dict[str, Any]]) -> str:
+    """Format Q&A items as indented question/answer pairs, each followed by a blank line."""
+    return "\n".join(
+        f"  Q: {qa.get('question', '')}\n"
+        f"  A: {qa.get('score', 0)}/5 ({_SCORE_LABELS.get(qa.get('score', 0), 'Unknown')})\n"
+        for qa in qa_items
+    )
 
 
 def _validate_insights_structure(insights: Dict[str, Any]) -> bool:
@@ -324,27 +360,11 @@ def _validate_insights_structure(insights: Dict[str, Any]) -> bool:
     Returns:
         bool: True if valid, False otherwise
     """
-    required_fields = {
-        "dominant_emotion": str,
-        "summary": str,
-        "motivation_quote": str,
-        "suggestions": list,
-    }
-
-    for field, expected_type in required_fields.items():
-        if field not in insights:
-            print(f"⚠ Missing required field: {field}")
-            return False
-
-        if not isinstance(insights[field], expected_type):
-            print(
-                f"⚠ Invalid type for {field}: expected {expected_type}, got {type(insights[field])}"
-            )
-            return False
-
-    # Validate suggestions is a list of strings
-    if not all(isinstance(s, str) for s in insights["suggestions"]):
-        print(f"⚠ Suggestions must be a list of strings")
+    try:
+        AIInsights.model_validate(insights)
+        return True
+    except ValidationError as e:
+        logger.warning(
+            "Invalid insights structure: %s error(s): %s", e.error_count(), e.errors()
+        )
         return False
-
-    return True
@@ -10,9 +10,11 @@ This module handles all chat session operations including:
 
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Any
-from langchain_core.messages import HumanMessage, AIMessage, BaseMessage
+import logging
 from stressease.services.utility.firebase_config import get_firestore_client
 
+logger = logging.getLogger(__name__)
+
 
 # ============================================================================
 # USER PROFILE OPERATIONS
@@ -34,27 +36,23 @@ def get_user_profile(user_id: str) -> Optional[Dict[str, Any]]:
     db = get_firestore_client()
 
     try:
-        # Try structure: users/{user_id}/profile/data
-        doc_ref = (
-            db.collection("users")
-            .document(user_id)
-            .collection("profile")
-            .document("data")
-        )
-        doc = doc_ref.get()
+        # Preferred structure: users/{user_id}/profile/data
+        # Alternative structure: users/{user_id} (profile as document)
+        user_ref = db.collection("users").document(user_id)
+        profile_ref = user_ref.collection("profile").document("data")
 
-        if doc.exists:
-            return doc.to_dict()
+        # Fetch both candidates in one batched read (results are unordered)
+        docs = {doc.reference.path: doc for doc in db.get_all([profile_ref, user_ref])}
 
-        # Try alternative structure: users/{user_id} (profile as document)
-        user_doc = db.collection("users").document(user_id).get()
-        if user_doc.exists:
-            return user_doc.to_dict()
+        for ref in (profile_ref, user_ref):
+            doc = docs.get(ref.path)
+            if doc is not None and doc.exists:
+                return doc.to_dict()
 
         return None
 
     except Exception as e:
-        print(f"Error fetching user profile for {user_id}: {str(e)}")
+        logger.exception("Error fetching user profile for %s: %s", user_id, e)
         return None
 
 
@@ -93,49 +91,9 @@ def create_session_metadata(user_id: str, session_id: str) -> bool:
         return True
 
     except Exception as e:
-        print(f"Error creating session metadata for {user_id}/{session_id}: {str(e)}")
-        return False
-
-
-def update_session_activity(user_id: str, session_id: str) -> bool:
-    """
-    Update last_activity timestamp and increment message count for a session.
-
-    Collection: users/{user_id}/chat_sessions/{session_id}/metadata/info
-
-    Args:
-        user_id (str): Firebase Auth user ID
-        session_id (str): Session identifier
-
-    Returns:
-        bool: True if successful, False otherwise
-    """
-    db = get_firestore_client()
-
-    try:
-        from firebase_admin import firestore
-
-        metadata_ref = (
-            db.collection("users")
-            .document(user_id)
-            .collection("chat_sessions")
-            .document(session_id)
-            .collection("metadata")
-            .document("info")
-        )
-
-        # Update last activity and increment message count
-        metadata_ref.update(
-            {
-                "last_activity": datetime.utcnow(),
-                "message_count": firestore.Increment(1),
-            }
+        logger.exception(
+            "Error creating session metadata for %s/%s: %s", user_id, session_id, e
         )
-
-        return True
-
-    except Exception as e:
-        print(f"Error updating session activity for {user_id}/{session_id}: {str(e)}")
         return False
 
 
@@ -182,7 +140,9 @@ def check_session_expired(
         return last_activity < expiry_threshold
 
     except Exception as e:
-        print(f"Error checking session expiry for {user_id}/{session_id}: {str(e)}")
+        logger.exception(
+            "Error checking session expiry for %s/%s: %s", user_id, session_id, e
+        )
         return True  # Assume expired on error
 
 
@@ -214,7 +174,7 @@ def end_session(user_id: str, session_id: str) -> bool:
         return True
 
     except Exception as e:
-        print(f"Error ending session for {user_id}/{session_id}: {str(e)}")
+        logger.exception("Error ending session for %s/%s: %s", user_id, session_id, e)
         return False
 
 
@@ -225,9 +185,9 @@ def end_session(user_id: str, session_id: str) -> bool:
 
 def load_conversation_memory(
     user_id: str, session_id: str, max_messages: int = 25
-) -> List[BaseMessage]:
+) -> List[Dict[str, str]]:
     """
-    Load conversation history from Firestore and convert to LangChain message format.
+    Load conversation history from Firestore.
 
     Collection: users/{user_id}/chat_sessions/{session_id}/messages
 
@@ -237,7 +197,7 @@ def load_conversation_memory(
         max_messages (int): Maximum number of messages to load (default: 25)
 
     Returns:
-        List[BaseMessage]: List of LangChain HumanMessage and AIMessage objects
+        List[Dict[str, str]]: Messages as {"role": ..., "content": ...} dicts
     """
     db = get_firestore_client()
 
@@ -255,33 +215,34 @@ def load_conversation_memory(
             .limit(max_messages)
         )
 
-        docs = query.stream()
         messages = []
 
-        for doc in docs:
+        # Bounded by max_messages: fetch in one unary call rather than a stream
+        for doc in query.get():
             data = doc.to_dict()
-            role = data.get("role", "")
-            content = data.get("content", "")
-
-            if role == "user":
-                messages.append(HumanMessage(content=content))
-            elif role == "assistant":
-                messages.append(AIMessage(content=content))
+            messages.append(
+                {"role": data.get("role", ""), "content": data.get("content", "")}
+            )
 
         return messages
 
     except Exception as e:
-        print(f"Error loading conversation memory for {user_id}/{session_id}: {str(e)}")
+        logger.exception(
+            "Error loading conversation memory for %s/%s: %s", user_id, session_id, e
+        )
         return []
 
 
-def save_conversation_turn(
+def save_turn_and_touch(
     user_id: str, session_id: str, user_msg: str, ai_msg: str, turn_number: int
 ) -> bool:
     """
-    Save one conversation exchange (user message + AI response) to Firestore.
+    Save a conversation turn and update session activity in one batched write.
 
-    Collection: users/{user_id}/chat_sessions/{session_id}/messages
+    Adds the user and assistant messages under
+    users/{user_id}/chat_sessions/{session_id}/messages and bumps the
+    session's last_activity and message_count, all in a single Firestore
+    commit.
 
     Args:
         user_id (str): Firebase Auth user ID
@@ -296,35 +257,50 @@ def save_conversation_turn(
     db = get_firestore_client()
 
     try:
+        from firebase_admin import firestore
+
         timestamp = datetime.utcnow()
-        messages_ref = (
+        session_ref = (
             db.collection("users")
             .document(user_id)
             .collection("chat_sessions")
             .document(session_id)
-            .collection("messages")
         )
+        messages_ref = session_ref.collection("messages")
+        metadata_ref = session_ref.collection("metadata").document("info")
 
-        # Save user message
-        user_message_data = {
-            "role": "user",
-            "content": user_msg,
-            "timestamp": timestamp,
-            "turn": turn_number,
-        }
-        messages_ref.add(user_message_data)
-
-        # Save AI message
-        ai_message_data = {
-            "role": "assistant",
-            "content": ai_msg,
-            "timestamp": timestamp,
-            "turn": turn_number,
-        }
-        messages_ref.add(ai_message_data)
+        batch = db.batch()
+        batch.set(
+            messages_ref.document(),
+            {
+                "role": "user",
+                "content": user_msg,
+                "timestamp": timestamp,
+                "turn": turn_number,
+            },
+        )
+        batch.set(
+            messages_ref.document(),
+            {
+                "role": "assistant",
+                "content": ai_msg,
+                "timestamp": timestamp,
+                "turn": turn_number,
+            },
+        )
+        # merge=True so the batch still commits if the metadata document
+        # has not been created yet (it is written in the background too)
+        batch.set(
+            metadata_ref,
+            {"last_activity": timestamp, "message_count": firestore.Increment(1)},
+            merge=True,
+        )
+        batch.commit()
 
         return True
 
     except Exception as e:
-        print(f"Error saving conversation turn for {user_id}/{session_id}: {str(e)}")
+        logger.exception(
+            "Error saving conversation turn for %s/%s: %s", user_id, session_id, e
+        )
         return False
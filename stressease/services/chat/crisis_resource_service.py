@@ -7,8 +7,12 @@ crisis resources in Firestore.
 
 from datetime import datetime
 from typing import Dict, Optional, Any
+import logging
+from firebase_admin.firestore import FieldFilter
 from stressease.services.utility.firebase_config import get_firestore_client
 
+logger = logging.getLogger(__name__)
+
 
 # ============================================================================
 # CRISIS RESOURCES OPERATIONS
@@ -29,8 +33,8 @@ def get_cached_crisis_resources(country: str) -> Optional[Dict[str, Any]]:
     db = get_firestore_client()
 
     if not country or not country.strip():
-        print(
-            "Warning: Attempted to get cached crisis resources with an empty country parameter."
+        logger.warning(
+            "Attempted to get cached crisis resources with an empty country parameter."
         )
         return None
 
@@ -51,15 +55,18 @@ def get_cached_crisis_resources(country: str) -> Optional[Dict[str, Any]]:
 
         # If not found by exact match and it's a country name, try to find by country field
         if len(country_id) > 3:
-            query = db.collection("crisis_resources").where("country", "==", country_id)
-            docs = query.stream()
-            for doc in docs:
+            query = (
+                db.collection("crisis_resources")
+                .where(filter=FieldFilter("country", "==", country_id))
+                .limit(1)
+            )
+            for doc in query.get():
                 return doc.to_dict()
 
         return None
 
     except Exception as e:
-        print(f"Error getting cached crisis resources for {country}: {str(e)}")
+        logger.exception("Error getting cached crisis resources for %s: %s", country, e)
         return None
 
 
@@ -77,8 +84,8 @@ def cache_crisis_resources(country: str, resources: Dict[str, Any]) -> bool:
     db = get_firestore_client()
 
     if not country or not country.strip():
-        print(
-            "Warning: Attempted to cache crisis resources with an empty country parameter."
+        logger.warning(
+            "Attempted to cache crisis resources with an empty country parameter."
         )
         return False
 
@@ -99,5 +106,5 @@ def cache_crisis_resources(country: str, resources: Dict[str, Any]) -> bool:
         return True
 
     except Exception as e:
-        print(f"Error caching crisis resources for {country}: {str(e)}")
+        logger.exception("Error caching crisis resources for %s: %s", country, e)
         return False
@@ -553,6 +553,29 @@ class CrisisResources(BaseModel):
     online_resources: List[OnlineResource]
 
 
+# Parser, format instructions and prompt are built once at import; the
+# schema walk behind get_format_instructions() is not repeated per call
+_CRISIS_PARSER = PydanticOutputParser(pydantic_object=CrisisResources)
+_CRISIS_FORMAT_INSTRUCTIONS = _CRISIS_PARSER.get_format_instructions()
+
+_CRISIS_PROMPT = PromptTemplate(
+    template="""Generate a comprehensive list of mental health crisis resources for {country}.
+
+Include ONLY verified, legitimate resources:
+- One emergency service with number and description
+- 2-5 crisis hotlines with name, phone (with country code), description, and website
+- 2-5 online resources with name, description, and website
+
+Ensure all information is accurate and up-to-date.
+
+{format_instructions}
+
+Country: {country}""",
+    input_variables=["country"],
+    partial_variables={"format_instructions": _CRISIS_FORMAT_INSTRUCTIONS},
+)
+
+
 def find_crisis_resources(country: str) -> Optional[Dict[str, Any]]:
     """
     Generate country-specific crisis resources using structured output.
@@ -572,29 +595,8 @@ def find_crisis_resources(country: str) -> Optional[Dict[str, Any]]:
         raise RuntimeError("Gemini models not initialized. Call init_gemini() first.")
 
     try:
-        # Create Pydantic output parser
-        parser = PydanticOutputParser(pydantic_object=CrisisResources)
-
-        # Build prompt with format instructions
-        prompt = PromptTemplate(
-            template="""Generate a comprehensive list of mental health crisis resources for {country}.
-
-Include ONLY verified, legitimate resources:
-- One emergency service with number and description
-- 2-5 crisis hotlines with name, phone (with country code), description, and website
-- 2-5 online resources with name, description, and website
-
-Ensure all information is accurate and up-to-date.
-
-{format_instructions}
-
-Country: {country}""",
-            input_variables=["country"],
-            partial_variables={"format_instructions": parser.get_format_instructions()},
-        )
-
         # Chain: Prompt → Base LLM → Parser (LCEL)
-        chain = prompt | base_llm | parser
+        chain = _CRISIS_PROMPT | base_llm | _CRISIS_PARSER
 
         # Execute chain
         resources = chain.invoke({"country": country})
@@ -7,10 +7,80 @@ This module handles all mood tracking operations including:
 - Mood history retrieval
 """
 
-from datetime import datetime, date
-from typing import Dict, List, Optional, Any
+from datetime import date
+from typing import Dict, List, Optional, Any, Tuple
+import functools
+import logging
+import threading
+import cachetools
+from firebase_admin.firestore import SERVER_TIMESTAMP, Query
+from google.api_core import exceptions as gexc, retry
 from stressease.services.utility.firebase_config import get_firestore_client
 
+logger = logging.getLogger(__name__)
+
+
+# Short-lived cache of recent quiz score averages. The cache is per process
+# and upserts only invalidate the writing worker's copy, so the TTL is kept
+# short enough that other workers pick up a new log within seconds.
+# Format: {user_id: {limit: (avg, count)}}
+AVG_SCORE_CACHE_TTL = 30
+_avg_score_cache = cachetools.TTLCache(maxsize=10000, ttl=AVG_SCORE_CACHE_TTL)
+_avg_score_lock = threading.Lock()
+
+# Daily quiz questions per day_key (hand-curated, rarely edited)
+QUESTIONS_CACHE_TTL = 3600
+_questions_cache = cachetools.TTLCache(maxsize=32, ttl=QUESTIONS_CACHE_TTL)
+_questions_lock = threading.Lock()
+
+# Retry transient Firestore failures with exponential backoff. Every call it
+# wraps is idempotent (reads, and set() on deterministic document IDs).
+# Firestore errors that survive the retry are expected service failures and
+# are logged without a traceback; any other exception is a bug and is logged
+# with one. Either way the caller gets the function's empty result.
+FIRESTORE_RETRY = retry.Retry(
+    predicate=retry.if_exception_type(
+        gexc.DeadlineExceeded, gexc.ServiceUnavailable, gexc.Aborted
+    ),
+    initial=0.1,
+    maximum=2.0,
+    multiplier=2.0,
+    timeout=10.0,
+)
+
+# Field path for ordering by document ID. Mood log IDs are YYYY-MM-DD dates, so
+# the built-in key index returns logs newest-first with no secondary index.
+DOCUMENT_ID = "__name__"
+
+
+@functools.lru_cache(maxsize=1024)
+def _user_ref(db, user_id: str):
+    """
+    Return the users/{uid} document reference, memoized per client and user.
+
+    Args:
+        db: Firestore client
+        user_id (str): Firebase Auth user ID
+
+    Returns:
+        DocumentReference: Reference to users/{user_id}
+    """
+    return db.collection("users").document(user_id)
+
+
+def _mood_logs_ref(db, user_id: str):
+    """Return the users/{uid}/moodLogs collection reference."""
+    return _user_ref(db, user_id).collection("moodLogs")
+
+
+def _recent_mood_logs_query(db, user_id: str, limit: int):
+    """Return a query for the user's `limit` most recent mood logs (newest first)."""
+    return (
+        _mood_logs_ref(db, user_id)
+        .order_by(DOCUMENT_ID, direction=Query.DESCENDING)
+        .limit(limit)
+    )
+
 
 # ============================================================================
 # MOOD QUIZ OPERATIONS
@@ -45,37 +115,51 @@ def upsert_daily_mood_log(
     try:
         # Ensure date is set (use provided or today)
         date_str = daily_log.get("date") or date.today().isoformat()
-        daily_log["date"] = date_str
-
-        # Add server timestamp
-        daily_log["submitted_at"] = datetime.utcnow()
 
         # Upsert to nested collection: users/{uid}/moodLogs/{date}
-        # Document ID is just the date (user_id is in the path)
-        doc_ref = (
-            db.collection("users")
-            .document(user_id)
-            .collection("moodLogs")
-            .document(date_str)
+        # Document ID is just the date (user_id is in the path). The caller's
+        # dict is left untouched; date and server timestamp go on a copy.
+        doc_ref = _mood_logs_ref(db, user_id).document(date_str)
+        doc_ref.set(
+            {**daily_log, "date": date_str, "submitted_at": SERVER_TIMESTAMP},
+            retry=FIRESTORE_RETRY,
         )
-        doc_ref.set(daily_log)
 
-        print(f"✓ Upserted mood log for user {user_id}: {date_str}")
+        # Drop the cached score average so the new log is reflected
+        with _avg_score_lock:
+            _avg_score_cache.pop(user_id, None)
+
+        logger.debug("Upserted mood log for user %s: %s", user_id, date_str)
 
         return {"doc_id": date_str, "date": date_str, "operation": "upsert"}
 
+    except gexc.GoogleAPIError as e:
+        logger.error("Firestore error upserting mood log for %s: %s", user_id, e)
+        return None
     except Exception as e:
-        print(f"✗ Error upserting mood log for {user_id}: {str(e)}")
+        logger.exception("Unexpected error upserting mood log for %s: %s", user_id, e)
         return None
 
 
-def get_last_daily_mood_logs(user_id: str, limit: int = 7) -> List[Dict[str, Any]]:
+def get_last_daily_mood_logs(
+    user_id: str,
+    limit: int = 7,
+    fields: Optional[List[str]] = None,
+    start_after: Optional[str] = None,
+) -> List[Dict[str, Any]]:
     """
     Retrieve the most recent daily mood quiz logs for a user.
 
+    Pages through older logs with a query cursor: pass the "id" of the last
+    log from the previous page as start_after, so each page reads exactly
+    `limit` documents.
+
     Args:
         user_id (str): Firebase Auth user ID
         limit (int): Number of entries to retrieve (default: 7)
+        fields (list, optional): Field paths to project; when given, only
+            these fields are read from each document
+        start_after (str, optional): Log ID (YYYY-MM-DD) to continue after
 
     Returns:
         List[Dict[str, Any]]: List of daily mood logs (newest first)
@@ -83,85 +167,132 @@ def get_last_daily_mood_logs(user_id: str, limit: int = 7) -> List[Dict[str, Any
     db = get_firestore_client()
 
     try:
-        from firebase_admin import firestore
-
-        logs = []
         # Query nested collection: users/{uid}/moodLogs
-        query = (
-            db.collection("users")
-            .document(user_id)
-            .collection("moodLogs")
-            .order_by("submitted_at", direction=firestore.Query.DESCENDING)
-            .limit(limit)
+        query = _recent_mood_logs_query(db, user_id, limit)
+        if start_after:
+            query = query.start_after({DOCUMENT_ID: start_after})
+        if fields:
+            query = query.select(fields)
+        docs = query.get(retry=FIRESTORE_RETRY)
+        return [{**doc.to_dict(), "id": doc.id} for doc in docs]
+    except gexc.GoogleAPIError as e:
+        logger.error(
+            "Firestore error retrieving last daily mood logs for %s: %s", user_id, e
         )
-        docs = query.stream()
-        for doc in docs:
-            entry = doc.to_dict()
-            entry["id"] = doc.id
-            logs.append(entry)
-        return logs
+        return []
     except Exception as e:
-        print(f"Error retrieving last daily mood logs for {user_id}: {str(e)}")
+        logger.exception(
+            "Unexpected error retrieving last daily mood logs for %s: %s", user_id, e
+        )
         return []
 
 
-def get_daily_mood_logs_count(user_id: str) -> int:
+def get_avg_daily_total_score(
+    user_id: str, limit: int = 7
+) -> Tuple[Optional[float], int]:
     """
-    Count total number of daily mood logs for a user.
+    Average daily_total_score over the user's most recent mood logs.
+
+    Uses a server-side count()/avg() aggregation so no documents are
+    transferred. Every log written by the daily quiz endpoint carries a
+    daily_total_score, so the count is the number of scored logs. Falls back to
+    fetching the logs when the installed Firestore SDK has no aggregation
+    support. Results are cached per user for AVG_SCORE_CACHE_TTL seconds;
+    upsert_daily_mood_log() invalidates the cache in its own process only.
 
     Args:
         user_id (str): Firebase Auth user ID
+        limit (int): Number of most recent logs to average (default: 7)
 
     Returns:
-        int: Total count of documents in users/{uid}/moodLogs for the user
+        Tuple[Optional[float], int]: (average score, number of scored logs), or
+        (None, 0) if there is no data
     """
+    with _avg_score_lock:
+        cached = _avg_score_cache.get(user_id, {}).get(limit)
+    if cached is not None:
+        return cached
+
     db = get_firestore_client()
 
     try:
-        # Count documents in nested collection: users/{uid}/moodLogs
-        query = db.collection("users").document(user_id).collection("moodLogs")
-        count = 0
-        for _ in query.stream():
-            count += 1
-        return count
-    except Exception as e:
-        print(f"Error counting daily mood logs for {user_id}: {str(e)}")
-        return 0
+        query = _recent_mood_logs_query(db, user_id, limit)
 
-
-# ============================================================================
-# WEEKLY DASS OPERATIONS
-# ============================================================================
+        try:
+            aggregation = query.count(alias="count").avg(
+                "daily_total_score", alias="avg"
+            )
+        except AttributeError:
+            # Older google-cloud-firestore without avg() aggregation
+            scores = [
+                log["daily_total_score"]
+                for log in get_last_daily_mood_logs(
+                    user_id, limit=limit, fields=["daily_total_score"]
+                )
+                if log.get("daily_total_score") is not None
+            ]
+            result = (sum(scores) / len(scores), len(scores)) if scores else (None, 0)
+        else:
+            results = aggregation.get(retry=FIRESTORE_RETRY)[0]
+            values = {r.alias: r.value for r in results}
+            avg = values.get("avg")
+            # avg() skips logs without a numeric daily_total_score and is None
+            # when none have one; count() covers every log in the window
+            if avg is not None:
+                result = (float(avg), values["count"])
+            else:
+                result = (None, 0)
+
+        with _avg_score_lock:
+            _avg_score_cache.setdefault(user_id, {})[limit] = result
+        return result
+    except gexc.GoogleAPIError as e:
+        logger.error(
+            "Firestore error averaging daily mood scores for %s: %s", user_id, e
+        )
+        return None, 0
+    except Exception as e:
+        logger.exception(
+            "Unexpected error averaging daily mood scores for %s: %s", user_id, e
+        )
+        return None, 0
 
 
-def weekly_dass_exists(user_id: str, week_start: str, week_end: str) -> bool:
+def get_daily_mood_logs_count(user_id: str) -> int:
     """
-    Check if a weekly DASS record already exists for the given user and week.
+    Count total number of daily mood logs for a user.
 
     Args:
         user_id (str): Firebase Auth user ID
-        week_start (str): ISO date string for week start
-        week_end (str): ISO date string for week end
 
     Returns:
-        bool: True if a record exists, False otherwise
+        int: Total count of documents in users/{uid}/moodLogs for the user
     """
     db = get_firestore_client()
 
     try:
-        # Check nested collection: users/{uid}/weeklyDass/{week_start}_{week_end}
-        doc_id = f"{week_start}_{week_end}"
-        doc_ref = (
-            db.collection("users")
-            .document(user_id)
-            .collection("weeklyDass")
-            .document(doc_id)
-        )
-        doc = doc_ref.get()
-        return doc.exists
+        # Count documents in nested collection: users/{uid}/moodLogs
+        query = _mood_logs_ref(db, user_id)
+        try:
+            # Server-side count() aggregation: no documents transferred
+            aggregation = query.count(alias="count")
+            return int(aggregation.get(retry=FIRESTORE_RETRY)[0][0].value)
+        except AttributeError:
+            # Older SDK without count(): empty projection returns names only
+            return len(query.select([]).get(retry=FIRESTORE_RETRY))
+    except gexc.GoogleAPIError as e:
+        logger.error("Firestore error counting daily mood logs for %s: %s", user_id, e)
+        return 0
     except Exception as e:
-        print(f"Error checking weekly DASS existence for {user_id}: {str(e)}")
-        return False
+        logger.exception(
+            "Unexpected error counting daily mood logs for %s: %s", user_id, e
+        )
+        return 0
+
+
+# ============================================================================
+# WEEKLY DASS OPERATIONS
+# ============================================================================
 
 
 def save_weekly_dass_totals(
@@ -177,6 +308,9 @@ def save_weekly_dass_totals(
 
     Collection: users/{uid}/weeklyDass
 
+    The document ID is the week range, so this is an idempotent upsert:
+    repeated calls for the same week overwrite one record.
+
     Args:
         user_id (str): Firebase Auth user ID
         week_start (str): ISO date string for week start
@@ -197,22 +331,22 @@ def save_weekly_dass_totals(
             "depression_total": depression_total,
             "anxiety_total": anxiety_total,
             "stress_total": stress_total,
-            "calculated_at": datetime.utcnow(),
+            "calculated_at": SERVER_TIMESTAMP,
         }
 
         # Document ID is the week range
         doc_id = f"{week_start}_{week_end}"
-        doc_ref = (
-            db.collection("users")
-            .document(user_id)
-            .collection("weeklyDass")
-            .document(doc_id)
-        )
-        doc_ref.set(data)
+        doc_ref = _user_ref(db, user_id).collection("weeklyDass").document(doc_id)
+        doc_ref.set(data, retry=FIRESTORE_RETRY)
 
         return doc_id
+    except gexc.GoogleAPIError as e:
+        logger.error("Firestore error saving weekly DASS totals for %s: %s", user_id, e)
+        return None
     except Exception as e:
-        print(f"Error saving weekly DASS totals for {user_id}: {str(e)}")
+        logger.exception(
+            "Unexpected error saving weekly DASS totals for %s: %s", user_id, e
+        )
         return None
 
 
@@ -221,10 +355,61 @@ def save_weekly_dass_totals(
 # ============================================================================
 
 
+@cachetools.cached(_questions_cache, lock=_questions_lock)
+def _fetch_and_sort(day_key: str) -> Tuple[Dict[str, Any], ...]:
+    """
+    Read and order the questions for a day, cached for QUESTIONS_CACHE_TTL.
+
+    The questions/{day_key} documents are hand-curated and rarely change, so
+    each worker reads a day at most once per TTL window. Firestore errors
+    propagate and are therefore not cached.
+
+    Args:
+        day_key (str): Day identifier (e.g., "day_1", "day_2")
+
+    Returns:
+        Tuple[Dict]: Question objects in display order (empty if not found)
+    """
+    db = get_firestore_client()
+    # Only the questions field is used; skip any other metadata on the doc
+    doc_ref = db.collection("questions").document(day_key)
+    doc = doc_ref.get(field_paths=["questions"], retry=FIRESTORE_RETRY)
+
+    if not doc.exists:
+        logger.warning("No questions document found for %s", day_key)
+        return ()
+
+    data = doc.to_dict()
+    questions_field = data.get("questions", [])
+
+    # Handle both List and Map structures (matching frontend logic)
+    if isinstance(questions_field, list):
+        # Direct list of questions
+        return tuple(questions_field)
+    elif isinstance(questions_field, dict):
+        # Map structure - numeric keys first in numeric order, then any other
+        # keys alphabetically. Plain tuple keys compare in C and never mix
+        # int/str comparisons.
+        keyed = sorted(
+            (0, int(k), k) if k.isdecimal() else (1, 0, k) for k in questions_field
+        )
+        return tuple(questions_field[k] for _, _, k in keyed)
+    else:
+        logger.warning(
+            "Unexpected questions field structure for %s: %s",
+            day_key,
+            type(questions_field),
+        )
+        return ()
+
+
 def get_daily_questions(day_key: str) -> List[Dict[str, Any]]:
     """
     Fetch daily quiz questions from Firestore for context-aware AI insights.
 
+    Results are cached in-process per day_key for up to an hour; call
+    clear_daily_questions_cache() to pick up edits immediately.
+
     Args:
         day_key (str): Day identifier (e.g., "day_1", "day_2")
 
@@ -232,45 +417,22 @@ def get_daily_questions(day_key: str) -> List[Dict[str, Any]]:
         List[Dict]: List of question objects with 'text', 'dimension', 'options', etc.
                     Returns empty list if not found or invalid structure.
     """
-    db = get_firestore_client()
-
     try:
-        doc_ref = db.collection("questions").document(day_key)
-        doc = doc_ref.get()
-
-        if not doc.exists:
-            print(f"⚠ No questions document found for {day_key}")
-            return []
-
-        data = doc.to_dict()
-        questions_field = data.get("questions", [])
-
-        # Handle both List and Map structures (matching frontend logic)
-        if isinstance(questions_field, list):
-            # Direct list of questions
-            return questions_field
-        elif isinstance(questions_field, dict):
-            # Map structure - extract values and sort by key if numeric
-            try:
-                # Try to sort numerically if keys are numbers
-                sorted_keys = sorted(
-                    questions_field.keys(), key=lambda x: int(x) if x.isdigit() else x
-                )
-                return [questions_field[k] for k in sorted_keys]
-            except (ValueError, TypeError):
-                # Fallback to values without sorting
-                return list(questions_field.values())
-        else:
-            print(
-                f"⚠ Unexpected questions field structure for {day_key}: {type(questions_field)}"
-            )
-            return []
-
+        return list(_fetch_and_sort(day_key))
+    except gexc.GoogleAPIError as e:
+        logger.error("Firestore error fetching questions for %s: %s", day_key, e)
+        return []
     except Exception as e:
-        print(f"✗ Error fetching questions for {day_key}: {str(e)}")
+        logger.exception("Unexpected error fetching questions for %s: %s", day_key, e)
         return []
 
 
+def clear_daily_questions_cache() -> None:
+    """Drop cached daily questions so the next call re-reads Firestore."""
+    with _questions_lock:
+        _questions_cache.clear()
+
+
 # ============================================================================
 # DAILY QUIZ DUPLICATE PREVENTION
 # ============================================================================
@@ -291,19 +453,27 @@ def get_daily_mood_log_by_date(user_id: str, date_str: str) -> Optional[Dict[str
 
     try:
         # Direct document access in nested collection: users/{uid}/moodLogs/{date}
-        doc_ref = (
-            db.collection("users")
-            .document(user_id)
-            .collection("moodLogs")
-            .document(date_str)
-        )
-        doc = doc_ref.get()
+        doc_ref = _mood_logs_ref(db, user_id).document(date_str)
+        doc = doc_ref.get(retry=FIRESTORE_RETRY)
 
         if doc.exists:
             data = doc.to_dict()
             data["id"] = doc.id
             return data
         return None
+    except gexc.GoogleAPIError as e:
+        logger.error(
+            "Firestore error checking daily mood log for %s on %s: %s",
+            user_id,
+            date_str,
+            e,
+        )
+        return None
     except Exception as e:
-        print(f"Error checking daily mood log for {user_id} on {date_str}: {str(e)}")
+        logger.exception(
+            "Unexpected error checking daily mood log for %s on %s: %s",
+            user_id,
+            date_str,
+            e,
+        )
         return None
@@ -4,15 +4,106 @@ Provides data aggregation, trend analysis, and hybrid prediction (rule-based + L
 """
 
 from typing import Dict, List, Optional, Tuple
+from statistics import fmean
+import concurrent.futures
+import logging
+import threading
+import cachetools
 from langchain_core.prompts import PromptTemplate
 from langchain_core.output_parsers import StrOutputParser
+from config import Config
 from stressease.services.chat.llm_service import get_base_model
 
+logger = logging.getLogger(__name__)
+
+# Mood log fields read by the summary, trend and explanation steps
+_ANALYTICS_FIELDS = ["date", "submitted_at", "core_scores", "core_avg", "dass_today"]
+
+# Short-lived cache of the mood logs read for the final summary; empty or
+# failed reads are not cached. The cache is per process and a new mood log
+# only invalidates the writing worker's copy, so the TTL is kept short enough
+# that other workers pick up the log within a minute.
+# Format: {user_id: {days: result}}
+ANALYTICS_DATA_CACHE_TTL = 60
+_analytics_data_cache = cachetools.TTLCache(maxsize=10000, ttl=ANALYTICS_DATA_CACHE_TTL)
+_analytics_data_lock = threading.Lock()
+
+# LLM explanations keyed on the rule-derived inputs, which have low
+# cardinality (rounded averages, trend labels, capped day count).
+# Format: {(state, confidence, avg_mood, avg_stress, issue, mood, stress, days): str}
+_explanation_cache = cachetools.TTLCache(maxsize=4096, ttl=24 * 60 * 60)
+_explanation_lock = threading.Lock()
+
+# Longest the request waits for an LLM explanation before using the template
+EXPLANATION_TIMEOUT_SECONDS = 1.5
+
+# Explanation calls run here so the request thread can stop waiting on them
+_explanation_pool = concurrent.futures.ThreadPoolExecutor(
+    max_workers=4, thread_name_prefix="analytics-llm"
+)
+
+# Running + queued explanation jobs. When Gemini is slow and the backlog is
+# full, requests use the template at once instead of queuing behind it.
+EXPLANATION_MAX_PENDING = 8
+_explanation_slots = threading.BoundedSemaphore(EXPLANATION_MAX_PENDING)
+
+# Explanation prompt, built once at import
+_PROMPT = PromptTemplate(
+    input_variables=[
+        "state",
+        "confidence",
+        "avg_mood",
+        "avg_stress",
+        "dominant_issue",
+        "mood_trend",
+        "stress_trend",
+        "days_analyzed",
+    ],
+    template="""You are helping explain mental health analytics to a user.
+
+**Prediction (already determined):**
+- State: {state}
+- Confidence: {confidence}
+
+**User's Data Summary:**
+- Average Mood: {avg_mood}
+- Average Stress: {avg_stress}
+- Dominant Issue: {dominant_issue}
+- Mood Trend: {mood_trend}
+- Stress Trend: {stress_trend}
+- Days Analyzed: {days_analyzed}
+
+Write a warm, non-clinical 2-3 sentence explanation of why we predicted "{state}", citing their mood/stress trends, with one gentle suggestion (chatbot, breathing exercises, or keep up the good work). Respond with only the explanation text.
+""",
+)
+
+# Chain: Prompt → Base LLM → String (LCEL), bound once the LLM is initialized
+_chain = None
+_chain_lock = threading.Lock()
+
+
+def _get_explanation_chain():
+    """
+    Return the explanation chain, building it on first use.
+
+    Raises:
+        RuntimeError: If Gemini models are not initialized
+    """
+    global _chain
+    if _chain is None:
+        with _chain_lock:
+            if _chain is None:
+                _chain = _PROMPT | get_base_model() | StrOutputParser()
+    return _chain
+
 
 def fetch_analytics_data(user_id: str, days: int = 7) -> Dict:
     """
     Fetch mood logs with graceful degradation for incomplete data.
 
+    Results with data are cached per user for ANALYTICS_DATA_CACHE_TTL
+    seconds; invalidate_analytics_data() clears them in its own process only.
+
     Args:
         user_id: Firebase Auth user ID
         days: Number of days to fetch (default: 7)
@@ -27,8 +118,15 @@ def fetch_analytics_data(user_id: str, days: int = 7) -> Dict:
     from stressease.services.mood.mood_service import get_last_daily_mood_logs
 
     try:
+        with _analytics_data_lock:
+            cached = _analytics_data_cache.get(user_id, {}).get(days)
+        if cached is not None:
+            return cached
+
         # Fetch last N days of mood logs
-        mood_logs = get_last_daily_mood_logs(user_id, limit=days)
+        mood_logs = get_last_daily_mood_logs(
+            user_id, limit=days, fields=_ANALYTICS_FIELDS
+        )
 
         # Edge Case 1: No data at all
         if not mood_logs:
@@ -39,25 +137,20 @@ def fetch_analytics_data(user_id: str, days: int = 7) -> Dict:
                 "data_quality": "no_data",
             }
 
-        # Edge Case 2: Less than 7 days
-        if len(mood_logs) < 7:
-            return {
-                "has_data": True,
-                "days_available": len(mood_logs),
-                "mood_logs": mood_logs,
-                "data_quality": "partial",
-            }
-
-        # Ideal case: Full 7 days
-        return {
+        # Edge Case 2: Less than 7 days ("partial"); ideal case: full 7 days
+        result = {
             "has_data": True,
             "days_available": len(mood_logs),
             "mood_logs": mood_logs,
-            "data_quality": "complete",
+            "data_quality": "partial" if len(mood_logs) < 7 else "complete",
         }
 
+        with _analytics_data_lock:
+            _analytics_data_cache.setdefault(user_id, {})[days] = result
+        return result
+
     except Exception as e:
-        print(f"Error fetching analytics data for {user_id}: {str(e)}")
+        logger.error("Error fetching analytics data for %s: %s", user_id, e)
         return {
             "has_data": False,
             "days_available": 0,
@@ -66,6 +159,20 @@ def fetch_analytics_data(user_id: str, days: int = 7) -> Dict:
         }
 
 
+def invalidate_analytics_data(user_id: str) -> None:
+    """
+    Drop cached analytics data for a user after their mood logs change.
+
+    Only affects this process; other workers serve their cached copy until
+    it expires after ANALYTICS_DATA_CACHE_TTL seconds.
+
+    Args:
+        user_id: Firebase Auth user ID
+    """
+    with _analytics_data_lock:
+        _analytics_data_cache.pop(user_id, None)
+
+
 def calculate_summary(mood_logs: List[Dict]) -> Dict:
     """
     Calculate avg_mood, avg_stress, and dominant_issue.
@@ -76,7 +183,8 @@ def calculate_summary(mood_logs: List[Dict]) -> Dict:
         mood_logs: List of mood log documents from Firestore
 
     Returns:
-        Dict with avg_mood, avg_stress, dominant_issue (all as strings)
+        Dict with avg_mood and avg_stress (rounded floats, or None when there
+        is no data) and dominant_issue; see format_summary_for_response()
     """
     mood_scores = []
 
@@ -86,43 +194,35 @@ def calculate_summary(mood_logs: List[Dict]) -> Dict:
     dass_stress_scores = []
 
     for log in mood_logs:
-        # Use pre-computed core_avg if available (includes mood, energy, sleep, stress)
-        # Otherwise fall back to individual mood score
-        if "core_avg" in log:
-            # core_avg is already the average of all 4 core questions
-            # For mood specifically, we can still use the individual score
-            mood_scores.append(log.get("core_scores", {}).get("mood", log["core_avg"]))
-        elif "core_scores" in log and "mood" in log["core_scores"]:
-            mood_scores.append(log["core_scores"]["mood"])
+        # Individual mood score, falling back to the pre-computed core_avg
+        # (average of the 4 core questions) when mood is missing
+        mood = (log.get("core_scores") or {}).get("mood")
+        if mood is None:
+            mood = log.get("core_avg")
+        if mood is not None:
+            mood_scores.append(mood)
 
         # DASS subscales (Questions 10-12)
-        dass = log.get("dass_today", {})
-        if "depression" in dass:
-            depression_scores.append(dass["depression"])
-        if "anxiety" in dass:
-            anxiety_scores.append(dass["anxiety"])
-        if "stress" in dass:
-            dass_stress_scores.append(dass["stress"])
+        dass = log.get("dass_today") or {}
+        depression = dass.get("depression")
+        if depression is not None:
+            depression_scores.append(depression)
+        anxiety = dass.get("anxiety")
+        if anxiety is not None:
+            anxiety_scores.append(anxiety)
+        stress = dass.get("stress")
+        if stress is not None:
+            dass_stress_scores.append(stress)
 
     # Calculate averages
-    avg_mood = round(sum(mood_scores) / len(mood_scores), 1) if mood_scores else None
-    avg_stress = (
-        round(sum(dass_stress_scores) / len(dass_stress_scores), 1)
-        if dass_stress_scores
-        else None
-    )
+    avg_mood = round(fmean(mood_scores), 1) if mood_scores else None
+    avg_stress = round(fmean(dass_stress_scores), 1) if dass_stress_scores else None
 
     # Determine dominant issue (highest average score = biggest problem)
     issue_avgs = {
-        "depression": (
-            sum(depression_scores) / len(depression_scores) if depression_scores else 0
-        ),
-        "anxiety": sum(anxiety_scores) / len(anxiety_scores) if anxiety_scores else 0,
-        "stress": (
-            sum(dass_stress_scores) / len(dass_stress_scores)
-            if dass_stress_scores
-            else 0
-        ),
+        "depression": fmean(depression_scores) if depression_scores else 0,
+        "anxiety": fmean(anxiety_scores) if anxiety_scores else 0,
+        "stress": fmean(dass_stress_scores) if dass_stress_scores else 0,
     }
 
     dominant_issue = (
@@ -130,12 +230,30 @@ def calculate_summary(mood_logs: List[Dict]) -> Dict:
     )
 
     return {
-        "avg_mood": str(avg_mood) if avg_mood else "--",
-        "avg_stress": str(avg_stress) if avg_stress else "--",
+        "avg_mood": avg_mood,
+        "avg_stress": avg_stress,
         "dominant_issue": dominant_issue,
     }
 
 
+def format_summary_for_response(summary: Dict) -> Dict:
+    """
+    Render a calculate_summary() result for the API response.
+
+    Args:
+        summary: Summary dict from calculate_summary()
+
+    Returns:
+        Dict with avg_mood, avg_stress ("--" when missing) and dominant_issue,
+        all as strings
+    """
+    return {
+        "avg_mood": str(summary["avg_mood"]) if summary["avg_mood"] else "--",
+        "avg_stress": str(summary["avg_stress"]) if summary["avg_stress"] else "--",
+        "dominant_issue": summary["dominant_issue"],
+    }
+
+
 def analyze_trends(mood_logs: List[Dict]) -> Dict:
     """
     Determine if mood/stress is increasing, declining, or stable.
@@ -152,34 +270,31 @@ def analyze_trends(mood_logs: List[Dict]) -> Dict:
     if len(mood_logs) < 2:
         return {"mood": "stable", "stress": "stable"}
 
+    # Single pass over the logs: (sort key, mood, stress) per day
+    rows = [
+        (
+            log.get("date", log.get("submitted_at", "")),
+            log.get("core_scores", {}).get("mood", 3),
+            log.get("dass_today", {}).get("stress", 3),
+        )
+        for log in mood_logs
+    ]
+
     # Sort by date (oldest first)
     try:
-        sorted_logs = sorted(
-            mood_logs, key=lambda x: x.get("date", x.get("submitted_at", ""))
-        )
-    except Exception:
-        # If sorting fails, use logs as-is
-        sorted_logs = mood_logs
+        rows.sort(key=lambda row: row[0])
+    except TypeError:
+        # Mixed key types (e.g. date string vs timestamp); use logs as-is
+        pass
 
-    # Split into first half and second half
-    midpoint = len(sorted_logs) // 2
-    first_half = sorted_logs[:midpoint]
-    second_half = sorted_logs[midpoint:]
+    _, moods, stresses = zip(*rows)
 
-    # Calculate mood trend
-    first_mood_avg = (
-        sum(log.get("core_scores", {}).get("mood", 3) for log in first_half)
-        / len(first_half)
-        if first_half
-        else 3.0
-    )
+    # Split into first half and second half (both non-empty since n >= 2)
+    midpoint = len(rows) // 2
 
-    second_mood_avg = (
-        sum(log.get("core_scores", {}).get("mood", 3) for log in second_half)
-        / len(second_half)
-        if second_half
-        else 3.0
-    )
+    # Calculate mood trend
+    first_mood_avg = fmean(moods[:midpoint])
+    second_mood_avg = fmean(moods[midpoint:])
 
     mood_diff = second_mood_avg - first_mood_avg
 
@@ -192,19 +307,8 @@ def analyze_trends(mood_logs: List[Dict]) -> Dict:
         mood_trend = "stable"
 
     # Calculate stress trend
-    first_stress_avg = (
-        sum(log.get("dass_today", {}).get("stress", 3) for log in first_half)
-        / len(first_half)
-        if first_half
-        else 3.0
-    )
-
-    second_stress_avg = (
-        sum(log.get("dass_today", {}).get("stress", 3) for log in second_half)
-        / len(second_half)
-        if second_half
-        else 3.0
-    )
+    first_stress_avg = fmean(stresses[:midpoint])
+    second_stress_avg = fmean(stresses[midpoint:])
 
     stress_diff = second_stress_avg - first_stress_avg
 
@@ -239,6 +343,11 @@ def generate_prediction(summary: Dict, trends: Dict, mood_logs: List[Dict]) -> D
         summary, trends, len(mood_logs)
     )
 
+    # A single day has no trend for the LLM to explain; use the template
+    if len(mood_logs) < 2:
+        reason = _template_based_explanation(state, confidence, summary, trends)
+        return {"state": state, "confidence": confidence, "reason": reason}
+
     # STEP 2: LLM generates human-relatable explanation
     reason = _generate_explanation_with_llm(
         state, confidence, summary, trends, mood_logs
@@ -264,15 +373,9 @@ def _calculate_prediction_with_rules(
     mood_trend = trends["mood"]
     stress_trend = trends["stress"]
 
-    # Parse averages (handle "--" for missing data)
-    try:
-        avg_mood = float(summary["avg_mood"]) if summary["avg_mood"] != "--" else 3.0
-        avg_stress = (
-            float(summary["avg_stress"]) if summary["avg_stress"] != "--" else 3.0
-        )
-    except (ValueError, TypeError):
-        avg_mood = 3.0
-        avg_stress = 3.0
+    # Missing averages count as neutral
+    avg_mood = summary["avg_mood"] if summary["avg_mood"] is not None else 3.0
+    avg_stress = summary["avg_stress"] if summary["avg_stress"] is not None else 3.0
 
     # Rule 1: Both improving → improving_wellbeing
     if mood_trend == "increasing" and stress_trend == "declining":
@@ -326,7 +429,13 @@ def _generate_explanation_with_llm(
     """
     Use BASE model to generate human-relatable explanation.
 
-    Falls back to template-based explanation if LLM fails.
+    Explanations depend only on the rule outputs and summary figures, so they
+    are cached for 24 hours under those inputs. Falls back to template-based
+    explanation if the LLM fails, takes longer than
+    EXPLANATION_TIMEOUT_SECONDS or already has EXPLANATION_MAX_PENDING
+    calls in flight (fallbacks are not cached). With
+    SKIP_LLM_EXPLANATION_LOW_CONF set, low-confidence predictions use the
+    template explanation directly.
 
     Args:
         state: Predicted state from rules
@@ -338,91 +447,84 @@ def _generate_explanation_with_llm(
     Returns:
         Human-readable explanation string
     """
-    # Prepare context for LLM
+    # Too little data for the LLM to add anything over the template
+    if confidence == "low" and Config.SKIP_LLM_EXPLANATION_LOW_CONF:
+        return _template_based_explanation(state, confidence, summary, trends)
+
+    days_analyzed = min(len(mood_logs), 7)
+    cache_key = (
+        state,
+        confidence,
+        summary["avg_mood"],
+        summary["avg_stress"],
+        summary["dominant_issue"],
+        trends["mood"],
+        trends["stress"],
+        days_analyzed,
+    )
+    with _explanation_lock:
+        cached = _explanation_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    # Prepare context for LLM (averages rendered as in the API response)
+    display = format_summary_for_response(summary)
     context_data = {
         "state": state.replace("_", " ").title(),
         "confidence": confidence.title(),
-        "avg_mood": f"{summary['avg_mood']}/5",
-        "avg_stress": f"{summary['avg_stress']}/5",
+        "avg_mood": f"{display['avg_mood']}/5",
+        "avg_stress": f"{display['avg_stress']}/5",
         "dominant_issue": summary["dominant_issue"],
         "mood_trend": trends["mood"],
         "stress_trend": trends["stress"],
-        "days_analyzed": len(mood_logs),
-        "recent_days_summary": "",
+        "days_analyzed": days_analyzed,
     }
 
-    # Add brief daily summary if available
-    if mood_logs:
-        recent = mood_logs[-3:]  # Last 3 days
-        recent_summary = "\n**Recent Days:**"
-        for i, log in enumerate(reversed(recent), 1):
-            core = log.get("core_scores", {})
-            dass = log.get("dass_today", {})
-            recent_summary += f"\n  {i} day(s) ago: Mood {core.get('mood', '?')}/5, Stress {dass.get('stress', '?')}/5"
-        context_data["recent_days_summary"] = recent_summary
-
-    # Create LangChain PromptTemplate
-    prompt = PromptTemplate(
-        input_variables=[
-            "state",
-            "confidence",
-            "avg_mood",
-            "avg_stress",
-            "dominant_issue",
-            "mood_trend",
-            "stress_trend",
-            "days_analyzed",
-            "recent_days_summary",
-        ],
-        template="""You are helping explain mental health analytics to a user.
-
-**Prediction (already determined):**
-- State: {state}
-- Confidence: {confidence}
-
-**User's Data Summary:**
-- Average Mood: {avg_mood}
-- Average Stress: {avg_stress}
-- Dominant Issue: {dominant_issue}
-- Mood Trend: {mood_trend}
-- Stress Trend: {stress_trend}
-- Days Analyzed: {days_analyzed}
-{recent_days_summary}
+    if not _explanation_slots.acquire(blocking=False):
+        logger.warning("LLM explanation backlog full; using template")
+        return _template_based_explanation(state, confidence, summary, trends)
 
-Write a supportive 2-3 sentence explanation that helps the user understand their mental health prediction.
+    # Bound the wait on Gemini; a late answer still lands in the cache
+    future = _explanation_pool.submit(_explain_and_cache, cache_key, context_data)
+    future.add_done_callback(lambda _: _explanation_slots.release())
+    try:
+        return future.result(timeout=EXPLANATION_TIMEOUT_SECONDS)
+    except concurrent.futures.TimeoutError:
+        # Drop the job if it has not started; a running call cannot be stopped
+        future.cancel()
+        logger.warning(
+            "LLM explanation timed out after %.1fs", EXPLANATION_TIMEOUT_SECONDS
+        )
+    except Exception as e:
+        logger.warning("LLM explanation failed: %s", e)
 
-Requirements:
-- Explain WHY we predicted "{state}" based on their trends
-- Mention specific patterns you notice (mood/stress trends)
-- Use warm, encouraging, non-clinical language
-- Include a gentle suggestion (use chatbot, breathing exercises, or keep up good work)
-- Respond with ONLY the explanation text, no JSON or formatting
+    # Fallback to template-based explanation
+    return _template_based_explanation(state, confidence, summary, trends)
 
-Example good explanations:
-- "Your mood has been improving and stress levels are declining over the past week. This positive trend suggests you're moving toward better wellbeing. Keep up the practices that are working for you!"
-- "Your stress levels have been rising while your mood is declining. This pattern suggests you may be experiencing increasing stress. Consider trying the breathing exercises or chatting with our support bot."
-""",
-    )
 
-    try:
-        model = get_base_model()  # Use BASE model as requested
+def _explain_and_cache(cache_key: Tuple, context_data: Dict) -> str:
+    """
+    Invoke the explanation chain and cache a valid result.
 
-        # Create LCEL chain
-        chain = prompt | model | StrOutputParser()
+    Args:
+        cache_key: Key in the explanation cache
+        context_data: Prompt variables
 
-        # Invoke chain
-        explanation = chain.invoke(context_data)
+    Returns:
+        Explanation text
 
-        # Basic validation - should be 2-3 sentences
-        if len(explanation) < 20:
-            raise ValueError("Explanation too short")
+    Raises:
+        ValueError: If the LLM returns an implausibly short explanation
+    """
+    explanation = _get_explanation_chain().invoke(context_data)
 
-        return explanation
+    # Basic validation - should be 2-3 sentences
+    if len(explanation) < 20:
+        raise ValueError("Explanation too short")
 
-    except Exception as e:
-        print(f"LLM explanation failed: {e}")
-        # Fallback to template-based explanation
-        return _template_based_explanation(state, confidence, summary, trends)
+    with _explanation_lock:
+        _explanation_cache[cache_key] = explanation
+    return explanation
 
 
 def _template_based_explanation(
@@ -2,12 +2,16 @@
 
 from typing import Dict, Any, Optional
 from datetime import datetime, timedelta
+import logging
+import threading
+import cachetools
 from pydantic import BaseModel, Field
 from langchain_core.prompts import PromptTemplate
-from langchain_core.output_parsers import PydanticOutputParser
 
 from stressease.services.chat.llm_service import base_llm
 
+logger = logging.getLogger(__name__)
+
 
 # ============================================================================
 # PYDANTIC MODEL FOR STRUCTURED OUTPUT
@@ -28,10 +32,103 @@ class StressPrediction(BaseModel):
     )
 
 
+# ============================================================================
+# PROMPT
+# ============================================================================
+
+# Static instructions first and the per-user metrics last, so every request
+# shares the same prompt prefix and only the short tail varies. This is the
+# shape Gemini's prefix/context caching reuses. The output format is enforced
+# through the response schema, so no format instructions are included.
+_PREDICTION_PREAMBLE = """You are an AI assistant analyzing mental health metrics to predict stress levels.
+
+**Metrics You Will Receive (7-day summary):**
+
+1. **Quiz Average Total Score** (12 questions daily, 1-5 scale, out of 60):
+   - This comprehensive score combines three dimensions:
+     • **Core Wellness** (4 questions): Mood, Energy, Sleep, Stress
+     • **Life Domains** (5 questions): Social, Work, Finance, etc.
+     • **DASS-21 Indicators** (3 questions): Depression, Anxiety, Stress
+
+2. **Mood Trend** (out of 5.0):
+   - Scale: 1=Very Poor, 2=Poor, 3=Neutral, 4=Good, 5=Excellent
+   - This represents general emotional well-being separate from stress
+   - Lower scores indicate deteriorating mental state
+
+3. **Support-Seeking Behavior** (chat sessions):
+   - Indicates user actively seeking help and coping support
+   - Higher count suggests struggling and proactively managing stress
+   - Zero sessions: Either doing well OR avoiding help (check other metrics)
+
+**Prediction Task:**
+Predict the probability that the user will experience HIGH stress tomorrow.
+
+**Score Interpretation Guidelines:**
+
+**Quiz Score Ranges:**
+- **Low (12-30)**: Critical wellness issues, very high stress risk
+- **Medium-Low (31-40)**: Significant challenges, elevated stress risk
+- **Medium (41-50)**: Some challenges, moderate stress risk
+- **High (51-60)**: Good overall wellness, low stress risk
+
+**Pattern Analysis:**
+- Low quiz + high chat count = Actively struggling but seeking help (still high risk)
+- Low quiz + low chat count = Isolation/avoidance (very high risk, concerning)
+- High quiz + high chat count = Proactive wellness management (lower risk)
+- High quiz + low chat count = Self-sufficient or naturally resilient (low risk)
+
+**Confidence Guidelines:**
+- **High confidence (0.8-1.0)**: All three metrics align clearly
+- **Medium confidence (0.5-0.7)**: Mixed signals or borderline values
+- **Low confidence (0.3-0.5)**: Contradictory patterns or extreme edge cases
+"""
+
+_PREDICTION_TAIL = """
+**User's 7-Day Mental Health Summary:**
+- Quiz Average Total Score: {avg_quiz_score}/60
+- Mood Trend: {avg_mood_score}/5.0
+- Support-Seeking Behavior: {chat_count} chat sessions
+
+Analyze the metrics holistically and predict:"""
+
+_PROMPT = PromptTemplate(
+    template=_PREDICTION_PREAMBLE + _PREDICTION_TAIL,
+    input_variables=["avg_mood_score", "chat_count", "avg_quiz_score"],
+)
+
+# Chain: Prompt → Base LLM (JSON mode), bound on first use
+_chain = None
+_chain_lock = threading.Lock()
+
+
+def _get_prediction_chain():
+    """
+    Return the prediction chain, building it on first use.
+
+    Gemini JSON mode: the response schema constrains decoding, so the prompt
+    needs no format instructions and the chain yields a StressPrediction.
+    """
+    global _chain
+    if _chain is None:
+        with _chain_lock:
+            if _chain is None:
+                _chain = _PROMPT | base_llm.with_structured_output(
+                    StressPrediction, method="json_schema"
+                )
+    return _chain
+
+
 # ============================================================================
 # PREDICTION LOGIC
 # ============================================================================
 
+# LLM predictions keyed on the three input metrics. Inputs are coarse (scores
+# rounded to 2 decimals, integer chat counts), so concurrent and repeat
+# requests from different users frequently share a key.
+# Format: {(avg_mood_score, chat_count, avg_quiz_score): prediction dict}
+_prediction_cache = cachetools.TTLCache(maxsize=4096, ttl=24 * 60 * 60)
+_prediction_lock = threading.Lock()
+
 
 def predict_stress(
     avg_mood_score: float, chat_count: int, avg_quiz_score: int
@@ -55,9 +152,9 @@ def predict_stress(
     # Calculate tomorrow's date
     tomorrow = (datetime.now() + timedelta(days=1)).strftime("%Y-%m-%d")
 
-    # Try LLM-based prediction first
+    # Try LLM-based prediction first (reusing a cached result for these inputs)
     try:
-        llm_result = _predict_with_llm(avg_mood_score, chat_count, avg_quiz_score)
+        llm_result = _cached_llm_prediction(avg_mood_score, chat_count, avg_quiz_score)
         if llm_result:
             return {
                 "date": tomorrow,
@@ -71,7 +168,7 @@ def predict_stress(
                 },
             }
     except Exception as e:
-        print(f"⚠ LLM prediction failed, using fallback: {str(e)}")
+        logger.warning("LLM prediction failed, using fallback: %s", e)
 
     # Fallback to deterministic calculation
     fallback_result = _fallback_prediction(avg_mood_score, chat_count, avg_quiz_score)
@@ -89,11 +186,13 @@ def predict_stress(
     }
 
 
-def _predict_with_llm(
+def _cached_llm_prediction(
     avg_mood_score: float, chat_count: int, avg_quiz_score: int
 ) -> Optional[Dict[str, Any]]:
     """
-    Use Gemini LLM to predict stress probability.
+    Return the LLM prediction for these metrics, calling Gemini only on a miss.
+
+    Failed predictions (None) are not cached so the next request retries.
 
     Args:
         avg_mood_score: 7-day average mood score (1.0 - 5.0)
@@ -103,70 +202,39 @@ def _predict_with_llm(
     Returns:
         Optional[Dict]: Prediction dict or None if LLM fails
     """
-    if base_llm is None:
-        raise RuntimeError("Gemini models not initialized. Call init_gemini() first.")
-
-    try:
-        # Create Pydantic output parser
-        parser = PydanticOutputParser(pydantic_object=StressPrediction)
-
-        # Build prompt template
-        prompt_template = PromptTemplate(
-            template="""You are an AI assistant analyzing mental health metrics to predict stress levels.
-
-**User's 7-Day Mental Health Summary:**
-
-1. **Quiz Breakdown** (12 questions daily, 1-5 scale):
-   - Average Total Score: {avg_quiz_score}/60
-   - This comprehensive score combines three dimensions:
-     • **Core Wellness** (4 questions): Mood, Energy, Sleep, Stress
-     • **Life Domains** (5 questions): Social, Work, Finance, etc.
-     • **DASS-21 Indicators** (3 questions): Depression, Anxiety, Stress
-
-2. **Mood Trend**: {avg_mood_score}/5.0
-   - Scale: 1=Very Poor, 2=Poor, 3=Neutral, 4=Good, 5=Excellent
-   - This represents general emotional well-being separate from stress
-   - Lower scores indicate deteriorating mental state
-
-3. **Support-Seeking Behavior**: {chat_count} chat sessions
-   - Indicates user actively seeking help and coping support
-   - Higher count suggests struggling and proactively managing stress
-   - Zero sessions: Either doing well OR avoiding help (check other metrics)
-
-**Prediction Task:**
-Predict the probability that the user will experience HIGH stress tomorrow.
-
-**Score Interpretation Guidelines:**
-
-**Quiz Score Ranges:**
-- **Low (12-30)**: Critical wellness issues, very high stress risk
-- **Medium-Low (31-40)**: Significant challenges, elevated stress risk
-- **Medium (41-50)**: Some challenges, moderate stress risk
-- **High (51-60)**: Good overall wellness, low stress risk
+    key = (round(avg_mood_score, 2), chat_count, round(avg_quiz_score, 2))
+    with _prediction_lock:
+        cached = _prediction_cache.get(key)
+    if cached is not None:
+        return dict(cached)
 
-**Pattern Analysis:**
-- Low quiz + high chat count = Actively struggling but seeking help (still high risk)
-- Low quiz + low chat count = Isolation/avoidance (very high risk, concerning)
-- High quiz + high chat count = Proactive wellness management (lower risk)
-- High quiz + low chat count = Self-sufficient or naturally resilient (low risk)
+    result = _predict_with_llm(avg_mood_score, chat_count, avg_quiz_score)
+    if result:
+        with _prediction_lock:
+            _prediction_cache[key] = dict(result)
+    return result
 
-**Confidence Guidelines:**
-- **High confidence (0.8-1.0)**: All three metrics align clearly
-- **Medium confidence (0.5-0.7)**: Mixed signals or borderline values
-- **Low confidence (0.3-0.5)**: Contradictory patterns or extreme edge cases
 
-{format_instructions}
+def _predict_with_llm(
+    avg_mood_score: float, chat_count: int, avg_quiz_score: int
+) -> Optional[Dict[str, Any]]:
+    """
+    Use Gemini LLM to predict stress probability.
 
-Analyze the metrics holistically and predict:""",
-            input_variables=["avg_mood_score", "chat_count", "avg_quiz_score"],
-            partial_variables={"format_instructions": parser.get_format_instructions()},
-        )
+    Args:
+        avg_mood_score: 7-day average mood score (1.0 - 5.0)
+        chat_count: Number of chat sessions in last 7 days
+        avg_quiz_score: Average sum of quiz questions over 7 days (12 - 60)
 
-        # Chain: Prompt → Base LLM → Parser
-        chain = prompt_template | base_llm | parser
+    Returns:
+        Optional[Dict]: Prediction dict or None if LLM fails
+    """
+    if base_llm is None:
+        raise RuntimeError("Gemini models not initialized. Call init_gemini() first.")
 
+    try:
         # Execute chain
-        prediction_model = chain.invoke(
+        prediction_model = _get_prediction_chain().invoke(
             {
                 "avg_mood_score": avg_mood_score,
                 "chat_count": chat_count,
@@ -175,7 +243,7 @@ Analyze the metrics holistically and predict:""",
         )
 
         # Convert Pydantic model to dict
-        result = prediction_model.dict()
+        result = prediction_model.model_dump()
 
         # Validate and clamp values
         result["stress_probability"] = max(0.0, min(1.0, result["stress_probability"]))
@@ -190,11 +258,11 @@ Analyze the metrics holistically and predict:""",
         else:
             result["label"] = "Low"
 
-        print(f"✓ LLM prediction successful: {result['label']} ({prob:.2f})")
+        logger.debug("LLM prediction: %s (%.2f)", result["label"], prob)
         return result
 
     except Exception as e:
-        print(f"✗ Error in LLM prediction: {str(e)}")
+        logger.error("Error in LLM prediction: %s", e)
         return None
 
 
@@ -245,8 +313,11 @@ def _fallback_prediction(
     # Fallback has lower confidence than LLM predictions
     confidence = 0.65
 
-    print(
-        f"✓ Fallback prediction: {label} ({stress_probability:.2f}) - confidence: {confidence}"
+    logger.debug(
+        "Fallback prediction: %s (%.2f) - confidence: %s",
+        label,
+        stress_probability,
+        confidence,
     )
 
     return {
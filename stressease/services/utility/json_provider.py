@@ -0,0 +1,50 @@
+"""
+orjson-backed JSON provider for Flask.
+
+Replaces the stdlib-based DefaultJSONProvider so jsonify() and
+app.json.dumps() serialize through orjson. Dates and datetimes (including
+Firestore timestamps) are passed through to Flask's default hook, as are types
+orjson does not handle natively such as Decimal, so the wire format is
+unchanged. Dataclasses are serialized by orjson itself.
+"""
+
+from typing import Any
+
+import orjson
+from flask.json.provider import DefaultJSONProvider
+
+
+_BASE_OPTIONS = (
+    orjson.OPT_NON_STR_KEYS
+    | orjson.OPT_SERIALIZE_NUMPY
+    | orjson.OPT_PASSTHROUGH_DATETIME
+)
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider that serializes with orjson."""
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        """
+        Serialize data as JSON to a string.
+
+        Honors the ``sort_keys``, ``indent`` and ``default`` arguments used by
+        Flask; other stdlib-specific arguments (``separators``,
+        ``ensure_ascii``) are ignored since orjson always emits compact UTF-8.
+
+        Args:
+            obj (Any): The data to serialize
+            **kwargs: Arguments Flask would pass to json.dumps
+
+        Returns:
+            str: JSON document
+        """
+        option = _BASE_OPTIONS
+        if kwargs.get("sort_keys", self.sort_keys):
+            option |= orjson.OPT_SORT_KEYS
+        if kwargs.get("indent"):
+            option |= orjson.OPT_INDENT_2
+
+        return orjson.dumps(
+            obj, default=kwargs.get("default", self.default), option=option
+        ).decode()
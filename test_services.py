@@ -0,0 +1,488 @@
+"""Behaviour checks for API endpoints and services, with Firebase and Gemini mocked."""
+
+import sys
+import os
+import dataclasses
+import datetime
+import decimal
+import json
+import threading
+from unittest import mock
+
+import pytest
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import stressease
+from config import Config
+from stressease.api import chat, predict
+from stressease.services.mood import mood_service
+from stressease.services.prediction import analytics_service
+from stressease.services.utility.json_provider import OrjsonProvider
+
+AUTH_HEADERS = {"Authorization": "Bearer test-token"}
+
+
+@pytest.fixture
+def client(monkeypatch):
+    """Flask test client with Firebase, Gemini and token checks mocked out."""
+    from stressease.services.utility import firebase_config
+    from stressease.services.chat import llm_service
+
+    def mock_init_firebase(path=None):
+        firebase_config.db = mock.MagicMock()
+
+    def mock_init_gemini(api_key):
+        llm_service.base_llm = mock.MagicMock()
+        llm_service.advance_llm = mock.MagicMock()
+
+    monkeypatch.setattr(Config, "GEMINI_API_KEY", "test-key")
+    monkeypatch.setattr(firebase_config, "init_firebase", mock_init_firebase)
+    monkeypatch.setattr(llm_service, "init_gemini", mock_init_gemini)
+    monkeypatch.setattr(
+        "firebase_admin.auth.verify_id_token", lambda token: {"uid": "user-1"}
+    )
+
+    from stressease import create_app
+
+    app = create_app()
+    return app.test_client()
+
+
+# ============================================================================
+# JSON PROVIDER
+# ============================================================================
+
+
+@dataclasses.dataclass
+class _Point:
+    x: int
+    y: int
+
+
+def test_orjson_provider_matches_default_provider():
+    """Datetimes, dataclasses and fallback types serialize as Flask would."""
+    app = Flask(__name__)
+    payload = {
+        "when": datetime.datetime(2024, 1, 2, 3, 4, 5),
+        "day": datetime.date(2024, 1, 2),
+        "amount": decimal.Decimal("1.50"),
+        "point": _Point(1, 2),
+        "text": "caf\u00e9",
+        "nested": {"b": [1, 2.5, None], "a": True},
+    }
+
+    expected = json.loads(DefaultJSONProvider(app).dumps(payload))
+    assert json.loads(OrjsonProvider(app).dumps(payload)) == expected
+    assert expected["when"] == "Tue, 02 Jan 2024 03:04:05 GMT"
+
+
+def test_orjson_provider_honors_sort_keys():
+    """sort_keys orders keys; compact output has no whitespace."""
+    provider = OrjsonProvider(Flask(__name__))
+
+    assert provider.dumps({"b": 1, "a": 2}, sort_keys=True) == '{"a":2,"b":1}'
+    assert provider.dumps({"b": 1, "a": 2}, sort_keys=False) == '{"b":1,"a":2}'
+
+
+# ============================================================================
+# REQUEST SIZE LIMIT
+# ============================================================================
+
+
+@pytest.mark.parametrize("path", ["/api/predict", "/api/mood/quiz/daily"])
+def test_oversized_body_returns_json_413(client, path):
+    """Bodies over MAX_CONTENT_LENGTH get the API's JSON error shape."""
+    response = client.post(
+        path,
+        data="x" * (Config.MAX_CONTENT_LENGTH + 1),
+        content_type="application/json",
+        headers=AUTH_HEADERS,
+    )
+
+    assert response.status_code == 413
+    assert response.get_json()["error_code"] == "PAYLOAD_TOO_LARGE"
+
+
+# ============================================================================
+# STRESS PREDICTION
+# ============================================================================
+
+
+@pytest.mark.parametrize(
+    "payload",
+    [
+        {"chatCount": 3},
+        {"avgMoodScore": 9, "chatCount": 3},
+        {"avgMoodScore": "high", "chatCount": 3},
+        {"avgMoodScore": 3.0, "chatCount": -1},
+    ],
+)
+def test_predict_rejects_invalid_input_before_firestore(client, monkeypatch, payload):
+    """Invalid metrics return 400 without reading quiz scores from Firestore."""
+    calculate_avg_quiz_score = mock.Mock(return_value=(30.0, 7))
+    monkeypatch.setattr(predict, "_calculate_avg_quiz_score", calculate_avg_quiz_score)
+
+    response = client.post("/api/predict", json=payload, headers=AUTH_HEADERS)
+
+    assert response.status_code == 400
+    assert response.get_json()["success"] is False
+    calculate_avg_quiz_score.assert_not_called()
+
+
+# ============================================================================
+# SESSION CACHE EVICTION
+# ============================================================================
+
+
+def test_session_cache_keeps_reinserted_session():
+    """A session resumed after its TTL is not ended by the expiry sweep."""
+    now = [0]
+    ended = []
+
+    with mock.patch.object(chat, "_end_evicted_session", ended.append):
+        sessions = chat._SessionCache(maxsize=4, ttl=10, timer=lambda: now[0])
+        sessions[("user-1", "resumed")] = {"message_count": 1}
+        sessions[("user-1", "idle")] = {"message_count": 1}
+
+        now[0] = 20
+        assert sessions.get(("user-1", "resumed")) is None
+        sessions[("user-1", "resumed")] = {"message_count": 2}
+
+    # Only the other expired session is ended; the resumed one stays cached
+    assert ended == [("user-1", "idle")]
+    assert sessions[("user-1", "resumed")] == {"message_count": 2}
+
+
+def test_session_cache_ends_lru_session_on_overflow():
+    """Evicting the least recently used session marks it as ended."""
+    ended = []
+
+    with mock.patch.object(chat, "_end_evicted_session", ended.append):
+        sessions = chat._SessionCache(maxsize=2, ttl=60)
+        sessions[("user-1", "a")] = {}
+        sessions[("user-1", "b")] = {}
+        sessions[("user-1", "c")] = {}
+
+    assert ended == [("user-1", "a")]
+
+
+# ============================================================================
+# COUNTRY VALIDATION
+# ============================================================================
+
+
+@pytest.mark.parametrize(
+    "country, expected",
+    [
+        ("uk", "United Kingdom"),
+        ("england", "United Kingdom"),
+        ("russia", "Russian Federation"),
+        ("turkey", "Türkiye"),
+        ("usa", "United States"),
+        ("india", "India"),
+        ("de", "Germany"),
+    ],
+)
+def test_resolve_country_common_names(country, expected):
+    """Common names, aliases and ISO codes resolve to a canonical country."""
+    assert chat._resolve_country(country) == expected
+
+
+@pytest.mark.parametrize("country", ["qwzxv", "ab", "tom", "bob", "a", "zz"])
+def test_resolve_country_unknown(country):
+    """Strings that are not a country name, alias or ISO code resolve to None."""
+    assert chat._resolve_country(country) is None
+
+
+def test_crisis_resources_rejects_long_country(client):
+    """Country values over 100 characters are rejected before any lookup."""
+    response = client.get(
+        "/api/chat/crisis-resources",
+        query_string={"country": "x" * 101},
+        headers=AUTH_HEADERS,
+    )
+
+    assert response.status_code == 400
+    assert response.get_json()["error_code"] == "VALIDATION_ERROR"
+
+
+def test_crisis_resources_rate_limits_unknown_countries(client, monkeypatch):
+    """Lookups for unrecognized countries are capped per user."""
+    monkeypatch.setattr(chat, "_unknown_country_lookups", {})
+    monkeypatch.setattr(chat, "_resource_response_cache", {})
+    monkeypatch.setattr(
+        chat, "get_sos_contacts", lambda country: {"contacts": [], "cached_at": None}
+    )
+
+    statuses = [
+        client.get(
+            "/api/chat/crisis-resources",
+            query_string={"country": f"qwzxv{i}"},
+            headers=AUTH_HEADERS,
+        ).status_code
+        for i in range(chat.MAX_UNKNOWN_COUNTRY_LOOKUPS + 1)
+    ]
+
+    assert statuses[:-1] == [200] * chat.MAX_UNKNOWN_COUNTRY_LOOKUPS
+    assert statuses[-1] == 429
+
+
+def test_crisis_resources_shares_aliases(client, monkeypatch):
+    """Aliases of one country share a single SOS fetch and response."""
+    fetched = []
+
+    def mock_get_sos_contacts(country):
+        fetched.append(country)
+        return {"contacts": [], "cached_at": "2024-01-01"}
+
+    monkeypatch.setattr(chat, "_resource_response_cache", {})
+    monkeypatch.setattr(chat, "get_sos_contacts", mock_get_sos_contacts)
+
+    etags = {
+        client.get(
+            "/api/chat/crisis-resources",
+            query_string={"country": country},
+            headers=AUTH_HEADERS,
+        ).headers["ETag"]
+        for country in ("uk", "GB", "Britain", "United Kingdom")
+    }
+
+    assert fetched == ["United Kingdom"]
+    assert len(etags) == 1
+
+
+def test_crisis_resources_etag_not_modified(client, monkeypatch):
+    """A matching If-None-Match gets an empty 304 with the same ETag."""
+    monkeypatch.setattr(chat, "_resource_response_cache", {})
+    monkeypatch.setattr(
+        chat,
+        "get_sos_contacts",
+        lambda country: {"contacts": [], "cached_at": "2024-01-01"},
+    )
+
+    first = client.get(
+        "/api/chat/crisis-resources",
+        query_string={"country": "India"},
+        headers=AUTH_HEADERS,
+    )
+    etag = first.headers["ETag"]
+    assert first.status_code == 200
+    assert first.headers["Cache-Control"] == "public, max-age=86400"
+
+    repeat = client.get(
+        "/api/chat/crisis-resources",
+        query_string={"country": "India"},
+        headers={**AUTH_HEADERS, "If-None-Match": etag},
+    )
+    assert repeat.status_code == 304
+    assert repeat.data == b""
+    assert repeat.headers["ETag"] == etag
+
+
+# ============================================================================
+# ANALYTICS SUMMARY
+# ============================================================================
+
+
+def test_calculate_summary_averages():
+    """Averages are rounded floats and the highest DASS subscale dominates."""
+    mood_logs = [
+        {
+            "core_scores": {"mood": 4},
+            "dass_today": {"depression": 1, "anxiety": 4, "stress": 2},
+        },
+        {"core_avg": 2.5, "dass_today": {"depression": 2, "anxiety": 3, "stress": 3}},
+    ]
+
+    summary = analytics_service.calculate_summary(mood_logs)
+
+    assert summary["avg_mood"] == 3.2
+    assert summary["avg_stress"] == 2.5
+    assert summary["dominant_issue"] == "anxiety"
+    assert analytics_service.format_summary_for_response(summary) == {
+        "avg_mood": "3.2",
+        "avg_stress": "2.5",
+        "dominant_issue": "anxiety",
+    }
+
+
+def test_calculate_summary_without_scores():
+    """Missing scores give None averages, rendered as "--" in responses."""
+    summary = analytics_service.calculate_summary([{}, {"core_scores": {}}])
+
+    assert summary["avg_mood"] is None
+    assert summary["avg_stress"] is None
+    assert summary["dominant_issue"] == "unknown"
+
+    formatted = analytics_service.format_summary_for_response(summary)
+    assert formatted["avg_mood"] == "--"
+    assert formatted["avg_stress"] == "--"
+
+
+def test_analytics_data_cache_reads_once_until_invalidated(monkeypatch):
+    """Repeat fetches reuse the cached logs until a new log invalidates them."""
+    reads = []
+
+    def mock_get_last_daily_mood_logs(user_id, limit=7, fields=None):
+        reads.append(limit)
+        return [{"id": "2024-01-02", "date": "2024-01-02"}]
+
+    monkeypatch.setattr(
+        mood_service, "get_last_daily_mood_logs", mock_get_last_daily_mood_logs
+    )
+    monkeypatch.setattr(analytics_service, "_analytics_data_cache", {})
+
+    first = analytics_service.fetch_analytics_data("user-1")
+    assert analytics_service.fetch_analytics_data("user-1") is first
+    assert reads == [7]
+
+    analytics_service.invalidate_analytics_data("user-1")
+    assert analytics_service.fetch_analytics_data("user-1") == first
+    assert reads == [7, 7]
+
+
+# ============================================================================
+# ANALYTICS EXPLANATION
+# ============================================================================
+
+_EXPLANATION_ARGS = (
+    "high_stress",
+    "high",
+    {"avg_mood": 2.0, "avg_stress": 4.0, "dominant_issue": "stress"},
+    {"mood": "declining", "stress": "increasing"},
+    [{}] * 7,
+)
+
+
+def _template_explanation():
+    """Template fallback for _EXPLANATION_ARGS."""
+    state, confidence, summary, trends, _ = _EXPLANATION_ARGS
+    return analytics_service._template_based_explanation(
+        state, confidence, summary, trends
+    )
+
+
+def test_explanation_timeout_falls_back_to_template(monkeypatch):
+    """A Gemini call slower than the timeout yields the template text."""
+    release = threading.Event()
+    chain = mock.Mock()
+    # Too short to be cached once released, so the late answer is dropped
+    chain.invoke.side_effect = lambda context: release.wait(5) and "late"
+
+    monkeypatch.setattr(Config, "SKIP_LLM_EXPLANATION_LOW_CONF", False)
+    monkeypatch.setattr(analytics_service, "_explanation_cache", {})
+    monkeypatch.setattr(analytics_service, "_get_explanation_chain", lambda: chain)
+    monkeypatch.setattr(analytics_service, "EXPLANATION_TIMEOUT_SECONDS", 0.05)
+
+    try:
+        explanation = analytics_service._generate_explanation_with_llm(
+            *_EXPLANATION_ARGS
+        )
+    finally:
+        release.set()
+
+    assert explanation == _template_explanation()
+
+
+def test_explanation_backlog_full_falls_back_to_template(monkeypatch):
+    """With every pending slot taken, the LLM is not called at all."""
+    slots = threading.BoundedSemaphore(1)
+    slots.acquire()
+    chain = mock.Mock()
+
+    monkeypatch.setattr(Config, "SKIP_LLM_EXPLANATION_LOW_CONF", False)
+    monkeypatch.setattr(analytics_service, "_explanation_cache", {})
+    monkeypatch.setattr(analytics_service, "_get_explanation_chain", lambda: chain)
+    monkeypatch.setattr(analytics_service, "_explanation_slots", slots)
+
+    explanation = analytics_service._generate_explanation_with_llm(*_EXPLANATION_ARGS)
+
+    assert explanation == _template_explanation()
+    chain.invoke.assert_not_called()
+
+
+# ============================================================================
+# QUIZ SCORE AVERAGE CACHE
+# ============================================================================
+
+
+def test_avg_score_cache_serves_repeat_reads_until_new_log(monkeypatch):
+    """Repeat reads hit the cache; upserting a mood log invalidates it."""
+    db = mock.MagicMock()
+    mood_logs = db.collection.return_value.document.return_value.collection
+    recent_logs = mood_logs.return_value.order_by.return_value.limit.return_value
+    aggregation = recent_logs.count.return_value.avg.return_value
+    aggregation.get.return_value = [
+        [
+            mock.Mock(alias="count", value=2),
+            mock.Mock(alias="avg", value=30.0),
+        ]
+    ]
+    monkeypatch.setattr(mood_service, "get_firestore_client", lambda: db)
+    monkeypatch.setattr(mood_service, "_avg_score_cache", {})
+
+    assert mood_service.get_avg_daily_total_score("user-1") == (30.0, 2)
+    assert mood_service.get_avg_daily_total_score("user-1") == (30.0, 2)
+    assert aggregation.get.call_count == 1
+
+    mood_service.upsert_daily_mood_log("user-1", {"date": "2024-01-03"})
+    assert mood_service.get_avg_daily_total_score("user-1") == (30.0, 2)
+    assert aggregation.get.call_count == 2
+
+
+# ============================================================================
+# HEALTH CHECKS
+# ============================================================================
+
+
+def test_health_caches_healthy_results(client, monkeypatch):
+    """Repeat polls within the TTL are served from the cache."""
+    monkeypatch.setattr(stressease, "_health_cache", {"ts": 0.0, "payload": None})
+
+    first = client.get("/health")
+    second = client.get("/readyz")
+
+    assert first.status_code == second.status_code == 200
+    assert first.get_json()["timestamp"] == second.get_json()["timestamp"]
+
+
+def test_health_does_not_cache_failures(client, monkeypatch):
+    """A dependency that recovers is reported healthy on the next poll."""
+    from stressease.services.utility import firebase_config
+
+    monkeypatch.setattr(stressease, "_health_cache", {"ts": 0.0, "payload": None})
+    db = firebase_config.db
+    monkeypatch.setattr(firebase_config, "db", None)
+
+    failing = client.get("/health")
+    assert failing.status_code == 503
+    assert failing.get_json()["services"]["firebase"] == "unhealthy"
+
+    monkeypatch.setattr(firebase_config, "db", db)
+    assert client.get("/health").status_code == 200
+
+
+def test_health_probe_timeout(client, monkeypatch):
+    """A probe that outlives the timeout is reported unhealthy."""
+    release = threading.Event()
+
+    def slow_probe():
+        release.wait(5)
+        return "slow", "healthy", None
+
+    monkeypatch.setattr(stressease, "_health_cache", {"ts": 0.0, "payload": None})
+    monkeypatch.setattr(stressease, "_HEALTH_PROBE_TIMEOUT", 0.05)
+    monkeypatch.setitem(stressease._HEALTH_PROBES, "slow", slow_probe)
+
+    try:
+        response = client.get("/health")
+    finally:
+        release.set()
+
+    assert response.status_code == 503
+    assert response.get_json()["services"]["slow"] == "unhealthy"
+    assert response.get_json()["services"]["firebase"] == "healthy"